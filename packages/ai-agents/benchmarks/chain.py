@@ -0,0 +1,73 @@
+"""Local chain for the benchmark: anvil with the Foundry contracts deployed"""
+import json
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict
+
+from web3 import Web3
+
+CONTRACTS_DIR = Path(__file__).resolve().parents[2] / "contracts"
+
+# anvil's first default account
+ANVIL_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+def start_anvil(port: int, block_time: float = None) -> subprocess.Popen:
+    """Start anvil and wait until it answers"""
+    if shutil.which("anvil") is None:
+        raise Exception("anvil not found; install Foundry (https://getfoundry.sh)")
+
+    command = ["anvil", "--port", str(port), "--silent"]
+    if block_time:
+        command += ["--block-time", str(block_time)]
+    process = subprocess.Popen(command)
+
+    w3 = Web3(Web3.HTTPProvider(f"http://127.0.0.1:{port}"))
+    for _ in range(50):
+        if w3.is_connected():
+            return process
+        time.sleep(0.1)
+    process.terminate()
+    raise Exception("anvil did not start")
+
+def build_contracts():
+    """forge build in packages/contracts (forge-std must be installed under lib/)"""
+    if shutil.which("forge") is None:
+        raise Exception("forge not found; install Foundry (https://getfoundry.sh)")
+    result = subprocess.run(["forge", "build"], cwd=CONTRACTS_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(
+            f"forge build failed (try 'forge install foundry-rs/forge-std' in {CONTRACTS_DIR}):\n{result.stderr}"
+        )
+
+def _artifact(name: str) -> Dict:
+    with open(CONTRACTS_DIR / "out" / f"{name}.sol" / f"{name}.json") as f:
+        return json.load(f)
+
+def _deploy(w3: Web3, account, name: str, *args) -> str:
+    artifact = _artifact(name)
+    contract = w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"]["object"])
+    tx = contract.constructor(*args).build_transaction({
+        "from": account.address,
+        "nonce": w3.eth.get_transaction_count(account.address),
+    })
+    tx_hash = w3.eth.send_raw_transaction(account.sign_transaction(tx).rawTransaction)
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    if receipt.status != 1:
+        raise Exception(f"Deploying {name} failed")
+    return receipt.contractAddress
+
+def deploy_contracts(rpc_url: str, private_key: str = ANVIL_PRIVATE_KEY) -> Dict[str, str]:
+    """Deploy TalentRegistry, Investment and AutoRegistration with the signer as agent"""
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    account = w3.eth.account.from_key(private_key)
+
+    registry = _deploy(w3, account, "TalentRegistry")
+    investment = _deploy(w3, account, "Investment", registry)
+    auto_registration = _deploy(w3, account, "AutoRegistration", registry, investment, account.address)
+    return {
+        "REGISTRY_ADDRESS": registry,
+        "INVESTMENT_ADDRESS": investment,
+        "AUTO_REGISTRATION_ADDRESS": auto_registration,
+    }
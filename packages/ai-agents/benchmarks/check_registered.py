@@ -0,0 +1,99 @@
+"""Check check_many_registered against a local anvil node
+
+Deploys the contracts, registers a few developers, then compares
+check_many_registered with check_if_registered for registered and unknown
+usernames on each read path:
+
+- rpc-batch: JSON-RPC batch requests (anvil has no Multicall3)
+- multicall: Multicall3, only if one is deployed at MULTICALL3_ADDRESS
+- fallback: Multicall3 pointed at an address without code, so the batch
+  fails and every username is checked individually
+
+    python benchmarks/check_registered.py --registered 5 --unknown 20
+
+Exits non-zero if any path disagrees with the individual checks.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from chain import ANVIL_PRIVATE_KEY, build_contracts, deploy_contracts, start_anvil
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def run_checks(registered: List[str], unknown: List[str]) -> Dict[str, bool]:
+    from contract_integrator import EnhancedContractIntegrator
+
+    integrator = EnhancedContractIntegrator()
+    try:
+        for username in registered:
+            result = await integrator.register_developer(username, {})
+            if not result['success']:
+                raise Exception(f"Registering {username} failed: {result.get('error')}")
+
+        usernames = registered + unknown
+        expected = {username: await integrator.check_if_registered(username) for username in usernames}
+        if any(expected[username] for username in unknown) or not all(expected[username] for username in registered):
+            raise Exception(f"check_if_registered disagrees with the registrations made: {expected}")
+
+        paths = {"rpc-batch": False, "fallback": True}
+        if len(await integrator.w3.eth.get_code(integrator.multicall.address)) > 0:
+            paths["multicall"] = True
+        else:
+            print("No Multicall3 deployed on this node; skipping the multicall path")
+
+        outcomes = {}
+        for path, use_multicall in paths.items():
+            if path == "fallback":
+                # An address without code: aggregate3 returns nothing and fails to decode
+                integrator.__dict__.pop('multicall', None)
+                os.environ['MULTICALL3_ADDRESS'] = integrator.account.address
+            integrator._multicall_available = use_multicall
+            got = await integrator.check_many_registered(usernames)
+            outcomes[path] = got == expected
+            print(f"{path:<10} {'ok' if outcomes[path] else 'MISMATCH'}")
+            if not outcomes[path]:
+                print(f"  expected {expected}\n  got      {got}")
+        return outcomes
+    finally:
+        await integrator.aclose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Check check_many_registered against anvil")
+    parser.add_argument("--registered", type=int, default=3, help="developers to register first")
+    parser.add_argument("--unknown", type=int, default=10, help="usernames that are never registered")
+    args = parser.parse_args()
+
+    build_contracts()
+    port = _free_port()
+    anvil = start_anvil(port)
+    try:
+        rpc_url = f"http://127.0.0.1:{port}"
+        os.environ.update({
+            "AGENT_DATA_DIR": tempfile.mkdtemp(prefix="talentfi-check-"),
+            # Read the chain itself, not the local registry mirror
+            "REGISTRY_INDEX_ENABLED": "false",
+            "LENS_RPC_URL": rpc_url,
+            "PRIVATE_KEY": ANVIL_PRIVATE_KEY,
+            **deploy_contracts(rpc_url)
+        })
+        outcomes = asyncio.run(run_checks(
+            [f"registered-dev-{i}" for i in range(args.registered)],
+            [f"unknown-dev-{i}" for i in range(args.unknown)]
+        ))
+    finally:
+        anvil.terminate()
+    sys.exit(0 if all(outcomes.values()) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Local stand-in for the GitHub REST and GraphQL APIs used by the agents
+
+Users are synthetic and deterministic: everything about a login is derived
+from a hash of it, so repeated runs see the same data. Configured through
+environment variables:
+
+    BENCH_GITHUB_LATENCY_MS     added latency per request (default 50)
+    BENCH_GITHUB_RATE_LIMIT     core requests per window (default 5000)
+    BENCH_GITHUB_SEARCH_LIMIT   search requests per window (default 30)
+    BENCH_GITHUB_RATE_WINDOW    rate limit window in seconds (default 3600)
+    BENCH_GITHUB_USERS          users returned by search (default 1000)
+    BENCH_GITHUB_QUALITY_RATE   share of users that pass the quality check (default 0.5)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Request, Response
+
+LATENCY = float(os.getenv("BENCH_GITHUB_LATENCY_MS", "50")) / 1000
+WINDOW = float(os.getenv("BENCH_GITHUB_RATE_WINDOW", "3600"))
+LIMITS = {
+    "core": int(os.getenv("BENCH_GITHUB_RATE_LIMIT", "5000")),
+    "search": int(os.getenv("BENCH_GITHUB_SEARCH_LIMIT", "30")),
+    "graphql": int(os.getenv("BENCH_GITHUB_RATE_LIMIT", "5000")),
+}
+USERS = int(os.getenv("BENCH_GITHUB_USERS", "1000"))
+QUALITY_RATE = float(os.getenv("BENCH_GITHUB_QUALITY_RATE", "0.5"))
+
+LANGUAGES = ["Solidity", "TypeScript", "Rust", "Go", "Python", "JavaScript"]
+
+app = FastAPI()
+calls = Counter()
+_window_start = {resource: time.time() for resource in LIMITS}
+_used = Counter()
+
+def _seed(*parts) -> int:
+    return int(hashlib.sha256("/".join(map(str, parts)).encode()).hexdigest()[:12], 16)
+
+def _passes(login: str) -> bool:
+    return _seed(login, "quality") % 1000 < QUALITY_RATE * 1000
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _resource(path: str) -> str:
+    if path.startswith("/search"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+def _route(path: str) -> str:
+    parts = path.strip("/").split("/")
+    if parts[0] == "repos":
+        return "repos/:owner/:repo/languages"
+    if parts[0] == "users" and len(parts) > 2:
+        return f"users/:login/{parts[2]}"
+    if parts[0] == "users":
+        return "users/:login"
+    return parts[0]
+
+@app.middleware("http")
+async def github_behaviour(request: Request, call_next):
+    path = request.url.path
+    if path.startswith("/_bench"):
+        return await call_next(request)
+
+    await asyncio.sleep(LATENCY)
+    resource = _resource(path)
+    now = time.time()
+    if now - _window_start[resource] >= WINDOW:
+        _window_start[resource] = now
+        _used[resource] = 0
+    reset = int(_window_start[resource] + WINDOW)
+
+    headers = {
+        "X-RateLimit-Limit": str(LIMITS[resource]),
+        "X-RateLimit-Resource": resource,
+        "X-RateLimit-Reset": str(reset),
+    }
+    if _used[resource] >= LIMITS[resource]:
+        calls["rate_limited"] += 1
+        headers["X-RateLimit-Remaining"] = "0"
+        return Response(status_code=403, headers=headers, media_type="application/json",
+                        content=json.dumps({"message": "API rate limit exceeded"}))
+
+    response = await call_next(request)
+    calls[_route(path)] += 1
+    # Like GitHub, conditional requests answered with 304 are free
+    if response.status_code != 304:
+        _used[resource] += 1
+    else:
+        calls["not_modified"] += 1
+    headers["X-RateLimit-Remaining"] = str(LIMITS[resource] - _used[resource])
+    response.headers.update(headers)
+    return response
+
+def _json(request: Request, body) -> Response:
+    """JSON response with an ETag, answering matching conditional requests with 304"""
+    content = json.dumps(body)
+    etag = '"' + hashlib.md5(content.encode()).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+def _user(login: str) -> dict:
+    seed = _seed(login)
+    return {
+        "login": login,
+        "type": "User",
+        "name": login.replace("-", " ").title(),
+        "bio": "Smart contract developer" if _passes(login) else "Developer",
+        "company": None,
+        "followers": seed % 2000,
+        "following": seed % 150,
+        "public_repos": 5 + seed % 60,
+        "created_at": _iso(_now() - timedelta(days=365 + seed % 3000)),
+    }
+
+def _repos(login: str) -> list:
+    passes = _passes(login)
+    repos = []
+    for i in range(_user(login)["public_repos"]):
+        seed = _seed(login, i)
+        updated = _now() - timedelta(days=(seed % 60) if passes else 200 + seed % 500)
+        repos.append({
+            "name": f"repo-{i}",
+            "description": "ethereum defi protocol" if passes and i % 2 == 0 else "side project",
+            "stargazers_count": seed % (300 if passes else 5),
+            "forks_count": seed % 40,
+            "language": "Solidity" if passes and i % 3 == 0 else LANGUAGES[1 + seed % (len(LANGUAGES) - 1)],
+            "topics": ["web3"] if passes and i % 4 == 0 else [],
+            "updated_at": _iso(updated),
+            "pushed_at": _iso(updated),
+            "html_url": f"https://github.com/{login}/repo-{i}",
+        })
+    return repos
+
+def _languages(login: str, repo: str) -> dict:
+    seed = _seed(login, repo)
+    return {
+        LANGUAGES[(seed + k) % len(LANGUAGES)]: (seed >> (k * 4)) % 100000 + 1000
+        for k in range(1 + seed % 3)
+    }
+
+def _events(login: str) -> list:
+    events = []
+    for i in range(_seed(login, "events") % 30):
+        events.append({
+            "id": str(_seed(login, "event", i)),
+            "type": ["PushEvent", "PullRequestEvent", "IssuesEvent", "WatchEvent"][i % 4],
+            "created_at": _iso(_now() - timedelta(days=i)),
+            "payload": {"commits": [{}] * (1 + i % 3)},
+        })
+    return events
+
+@app.get("/users/{login}")
+def get_user(login: str, request: Request):
+    return _json(request, _user(login))
+
+@app.get("/users/{login}/repos")
+def get_repos(login: str, request: Request, sort: str = "updated", per_page: int = 30):
+    repos = _repos(login)
+    key = "stargazers_count" if sort == "stars" else "updated_at"
+    repos.sort(key=lambda repo: repo[key], reverse=True)
+    return _json(request, repos[:per_page])
+
+@app.get("/repos/{login}/{repo}/languages")
+def get_languages(login: str, repo: str, request: Request):
+    return _json(request, _languages(login, repo))
+
+@app.get("/users/{login}/events")
+def get_events(login: str, request: Request, per_page: int = 100):
+    return _json(request, _events(login)[:per_page])
+
+@app.get("/search/users")
+def search_users(request: Request, q: str, page: int = 1, per_page: int = 30):
+    # Each query sees its own slice of the synthetic population
+    offset = _seed(q) % USERS
+    start = (page - 1) * per_page
+    logins = [f"bench-user-{(offset + i) % USERS}" for i in range(start, min(start + per_page, USERS))]
+    return _json(request, {"total_count": USERS, "items": [{"login": login} for login in logins]})
+
+@app.post("/graphql")
+async def graphql(request: Request):
+    body = await request.json()
+    variables = body.get("variables", {})
+    repo_count = variables.get("repoCount", 100)
+    language_count = variables.get("languageCount", 20)
+
+    data = {}
+    for name, login in variables.items():
+        if not name.startswith("login"):
+            continue
+        calls["graphql_users"] += 1
+        user = _user(login)
+        repos = sorted(_repos(login), key=lambda repo: repo["stargazers_count"], reverse=True)[:repo_count]
+        days = {}
+        for event in _events(login):
+            if event["type"] == "PushEvent":
+                day = event["created_at"][:10]
+                days[day] = days.get(day, 0) + len(event["payload"]["commits"])
+        data[f"user{name[5:]}"] = {
+            "login": login,
+            "name": user["name"],
+            "bio": user["bio"],
+            "createdAt": user["created_at"],
+            "followers": {"totalCount": user["followers"]},
+            "following": {"totalCount": user["following"]},
+            "repositories": {
+                "totalCount": user["public_repos"],
+                "nodes": [{
+                    "name": repo["name"],
+                    "description": repo["description"],
+                    "stargazerCount": repo["stargazers_count"],
+                    "forkCount": repo["forks_count"],
+                    "updatedAt": repo["updated_at"],
+                    "url": repo["html_url"],
+                    "languages": {"edges": [
+                        {"size": size, "node": {"name": language}}
+                        for language, size in list(_languages(login, repo["name"]).items())[:language_count]
+                    ]},
+                } for repo in repos],
+            },
+            "contributionsCollection": {
+                "totalCommitContributions": sum(days.values()),
+                "contributionCalendar": {"weeks": [{"contributionDays": [
+                    {"date": day, "contributionCount": count} for day, count in sorted(days.items())
+                ]}]},
+            },
+        }
+    return {"data": data}
+
+@app.get("/_bench/stats")
+def stats():
+    return dict(calls)
+
+@app.post("/_bench/reset")
+def reset():
+    calls.clear()
+    _used.clear()
+    for resource in _window_start:
+        _window_start[resource] = time.time()
+    return {"ok": True}
@@ -0,0 +1,92 @@
+"""Local stand-in for the OpenAI chat completions endpoint
+
+Returns a well-formed analysis whose scores are derived from a hash of the
+prompt, so the same profile always gets the same verdict. Configured
+through environment variables:
+
+    BENCH_OPENAI_LATENCY_MS     base latency per completion (default 800)
+    BENCH_OPENAI_MS_PER_TOKEN   extra latency per completion token (default 0)
+    BENCH_OPENAI_ERROR_RATE     share of requests answered with 429 (default 0)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+
+from fastapi import FastAPI, Request, Response
+
+LATENCY = float(os.getenv("BENCH_OPENAI_LATENCY_MS", "800")) / 1000
+MS_PER_TOKEN = float(os.getenv("BENCH_OPENAI_MS_PER_TOKEN", "0")) / 1000
+ERROR_RATE = float(os.getenv("BENCH_OPENAI_ERROR_RATE", "0"))
+
+app = FastAPI()
+calls = Counter()
+
+def _analysis(prompt: str) -> dict:
+    seed = int(hashlib.sha256(prompt.encode()).hexdigest()[:12], 16)
+    match = re.search(r"Username: (\S+)", prompt)
+    username = match.group(1) if match else "dev"
+    return {
+        "confidence_score": 40 + seed % 60,
+        "skills_assessment": {
+            "validated_skills": ["Solidity", "TypeScript", "Smart Contracts"][:1 + seed % 3],
+            "missing_critical_skills": ["Security auditing"] if seed % 2 else [],
+            "skill_relevance_score": 1 + seed % 10,
+        },
+        "market_metrics": {
+            "growth_potential": 1 + (seed >> 4) % 10,
+            "suggested_initial_price": str(10 ** 15 * (1 + seed % 100)),
+            "suggested_token_name": f"{username} Token",
+            "suggested_token_symbol": username[:4].upper(),
+        },
+        "investment_thesis": ["Consistent smart contract work"],
+        "risk_factors": ["Synthetic benchmark profile"],
+    }
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    calls["requests"] += 1
+
+    seed = int(hashlib.sha256(f"{calls['requests']}".encode()).hexdigest()[:8], 16)
+    if seed % 10000 < ERROR_RATE * 10000:
+        calls["rate_limited"] += 1
+        return Response(status_code=429, headers={"retry-after-ms": "500"}, media_type="application/json",
+                        content=json.dumps({"error": {"message": "Rate limit reached", "type": "requests"}}))
+
+    prompt = "\n".join(message["content"] for message in body["messages"])
+    content = json.dumps(_analysis(prompt))
+    prompt_tokens = len(prompt) // 4
+    completion_tokens = len(content) // 4
+    await asyncio.sleep(LATENCY + MS_PER_TOKEN * completion_tokens)
+
+    calls["prompt_tokens"] += prompt_tokens
+    calls["completion_tokens"] += completion_tokens
+    return {
+        "id": f"chatcmpl-{calls['requests']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body["model"],
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content},
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+@app.get("/_bench/stats")
+def stats():
+    return dict(calls)
+
+@app.post("/_bench/reset")
+def reset():
+    calls.clear()
+    return {"ok": True}
@@ -0,0 +1,38 @@
+"""JSON-RPC proxy in front of anvil that counts calls per method
+
+    BENCH_RPC_UPSTREAM   node to forward to (default http://127.0.0.1:8545)
+"""
+import os
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI, Request, Response
+
+UPSTREAM = os.getenv("BENCH_RPC_UPSTREAM", "http://127.0.0.1:8545")
+
+app = FastAPI()
+calls = Counter()
+client = httpx.AsyncClient(timeout=60)
+
+@app.post("/")
+async def forward(request: Request):
+    body = await request.body()
+    payload = await request.json()
+    if isinstance(payload, list):
+        calls["batch_requests"] += 1
+        calls.update(item.get("method", "?") for item in payload)
+    else:
+        calls[payload.get("method", "?")] += 1
+    calls["http_requests"] += 1
+
+    upstream = await client.post(UPSTREAM, content=body, headers={"Content-Type": "application/json"})
+    return Response(content=upstream.content, status_code=upstream.status_code, media_type="application/json")
+
+@app.get("/_bench/stats")
+def stats():
+    return dict(calls)
+
+@app.post("/_bench/reset")
+def reset():
+    calls.clear()
+    return {"ok": True}
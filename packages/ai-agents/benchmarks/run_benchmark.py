@@ -0,0 +1,203 @@
+"""Offline end-to-end benchmark for the agents
+
+Runs GitHubClient, EnhancedDeveloperAnalyzer and EnhancedContractIntegrator
+against local stand-ins (fake_github.py, fake_openai.py, and anvil behind
+rpc_proxy.py) and reports throughput, per-stage latency percentiles and
+API call counts.
+
+    # GitHub fetch + analysis of 200 synthetic profiles, no chain needed
+    python benchmarks/run_benchmark.py --scenario profiles --users 200
+
+    # Full discovery -> registration pipeline against anvil
+    python benchmarks/run_benchmark.py --scenario pipeline --registrations 20
+
+    # Same, registering cohorts through AutoRegistration.registerDevelopers
+    PIPELINE_BATCH_REGISTRATION=true python benchmarks/run_benchmark.py --scenario pipeline
+
+Stand-in behaviour (latency, rate limits, error rates) is configured with
+the BENCH_* variables documented in each server module. Agent settings such
+as PIPELINE_FETCH_WORKERS or GITHUB_BACKEND are read from the environment
+as usual. Each run starts from an empty data directory unless --data-dir
+points at a previous one, which measures warm caches.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _start_server(module: str, port: int, env: Dict[str, str] = None) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BENCH_DIR,
+        env={**os.environ, **(env or {})}
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_bench/stats", timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise Exception(f"{module} did not start")
+
+def _server_stats(port: int) -> Dict[str, int]:
+    return httpx.get(f"http://127.0.0.1:{port}/_bench/stats").json()
+
+async def run_profiles(users: int) -> Dict:
+    """Fetch and analyze a fixed set of synthetic profiles"""
+    from ai_analyzer import EnhancedDeveloperAnalyzer
+    from github_graphql import create_github_client
+    from pipeline import Pipeline
+
+    github = create_github_client()
+    analyzer = EnhancedDeveloperAnalyzer()
+    analyzed = []
+
+    async def fetch(usernames):
+        profiles = await github.get_developers_data(usernames)
+        return [profiles.get(username) for username in usernames]
+
+    async def analyze(dev_data):
+        analysis = await analyzer.analyze_developer(dev_data)
+        if analysis:
+            analyzed.append(analysis)
+        return None
+
+    pipeline = (
+        Pipeline(queue_size=int(os.getenv("PIPELINE_QUEUE_SIZE", "10")))
+        .add_batch_stage("fetch", fetch, batch_size=int(os.getenv("PIPELINE_FETCH_BATCH_SIZE", "5")),
+                         max_wait=float(os.getenv("PIPELINE_FETCH_BATCH_WAIT", "0.5")),
+                         workers=int(os.getenv("PIPELINE_FETCH_WORKERS", "4")))
+        .add_stage("analyze", analyze, workers=int(os.getenv("PIPELINE_ANALYZE_WORKERS", "3")))
+    )
+    try:
+        await pipeline.run(f"bench-user-{i}" for i in range(users))
+    finally:
+        await github.aclose()
+    return {"profiles": len(analyzed), "stages": pipeline.stats()}
+
+async def run_pipeline(registrations: int, discovery_limit: int) -> Dict:
+    """Run AutoRegistrationAgent's discovery -> registration pipeline"""
+    from auto_registration import AutoRegistrationAgent
+
+    agent = AutoRegistrationAgent()
+    agent.max_registrations = registrations
+    agent.discovery_limit = discovery_limit
+    try:
+        results = await agent.discover_and_register()
+    finally:
+        await agent.aclose()
+    stages = agent._pipeline.stats()
+    return {
+        "profiles": stages["analyze"]["processed"],
+        "registrations": len(results),
+        "stages": stages
+    }
+
+def print_report(report: Dict):
+    print("\n=== Benchmark Report ===")
+    print(f"Scenario: {report['scenario']}")
+    print(f"Wall time: {report['wall_seconds']:.2f}s")
+    print(f"Profiles analyzed: {report['profiles']} ({report['profiles_per_second']:.2f}/s)")
+    if "registrations" in report:
+        print(f"Registrations: {report['registrations']}")
+
+    print("\nStage latency (seconds):")
+    print(f"  {'stage':<10} {'n':>6} {'p50':>8} {'p99':>8} {'max':>8}")
+    for name, stage in report["stages"].items():
+        print(f"  {name:<10} {stage['processed']:>6} {stage['p50_seconds']:>8.3f} "
+              f"{stage['p99_seconds']:>8.3f} {stage['max_seconds']:>8.3f}")
+
+    for service, counts in report["calls"].items():
+        print(f"\n{service} calls:")
+        for name, count in sorted(counts.items()):
+            print(f"  {name:<32} {count}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark against local GitHub, OpenAI and chain stand-ins")
+    parser.add_argument("--scenario", choices=["profiles", "pipeline"], default="profiles")
+    parser.add_argument("--users", type=int, default=100, help="profiles to fetch in the profiles scenario")
+    parser.add_argument("--registrations", type=int, default=10, help="registration cap in the pipeline scenario")
+    parser.add_argument("--discovery-limit", type=int, default=50, help="candidates to discover in the pipeline scenario")
+    parser.add_argument("--data-dir", help="reuse a data directory (warm caches) instead of a fresh one")
+    parser.add_argument("--anvil-block-time", type=float, help="mine blocks on an interval instead of per transaction")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="talentfi-bench-")
+    github_port, openai_port = _free_port(), _free_port()
+    processes: List[subprocess.Popen] = []
+    services = {"github": github_port, "openai": openai_port}
+
+    try:
+        processes.append(_start_server("fake_github", github_port))
+        processes.append(_start_server("fake_openai", openai_port))
+        os.environ.update({
+            "AGENT_DATA_DIR": data_dir,
+            "GITHUB_API_URL": f"http://127.0.0.1:{github_port}",
+            "GITHUB_API_KEY": "bench",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+            "OPENAI_API_KEY": "bench",
+        })
+
+        if args.scenario == "pipeline":
+            from chain import ANVIL_PRIVATE_KEY, build_contracts, deploy_contracts, start_anvil
+
+            anvil_port, proxy_port = _free_port(), _free_port()
+            build_contracts()
+            processes.append(start_anvil(anvil_port, args.anvil_block_time))
+            addresses = deploy_contracts(f"http://127.0.0.1:{anvil_port}")
+            processes.append(_start_server("rpc_proxy", proxy_port, {
+                "BENCH_RPC_UPSTREAM": f"http://127.0.0.1:{anvil_port}"
+            }))
+            services["rpc"] = proxy_port
+            os.environ.update({
+                "LENS_RPC_URL": f"http://127.0.0.1:{proxy_port}/",
+                "PRIVATE_KEY": ANVIL_PRIVATE_KEY,
+                **addresses
+            })
+
+        started = time.perf_counter()
+        if args.scenario == "profiles":
+            result = asyncio.run(run_profiles(args.users))
+        else:
+            result = asyncio.run(run_pipeline(args.registrations, args.discovery_limit))
+        wall_seconds = time.perf_counter() - started
+
+        report = {
+            "scenario": args.scenario,
+            "data_dir": data_dir,
+            "wall_seconds": wall_seconds,
+            "profiles_per_second": result["profiles"] / wall_seconds if wall_seconds else 0.0,
+            **result,
+            "calls": {service: _server_stats(port) for service, port in services.items()}
+        }
+        print_report(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare the agents' contract ABIs with a fresh forge build
+
+The artifacts in src/abi are read for their "abi" field only. This builds
+packages/contracts with forge and reports every contract whose ABI differs
+from the compiled one:
+
+    python benchmarks/sync_abi.py            # check, exit non-zero on drift
+    python benchmarks/sync_abi.py --write    # replace the drifted ABIs
+
+--write only replaces the "abi" field; the rest of each artifact is left
+as it is.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from chain import CONTRACTS_DIR, build_contracts
+
+ABI_DIR = Path(__file__).resolve().parent.parent / "src" / "abi"
+
+def _canonical(abi) -> list:
+    return sorted(json.dumps(entry, sort_keys=True) for entry in abi)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check src/abi against forge build output")
+    parser.add_argument("--write", action="store_true", help="update ABIs that differ")
+    args = parser.parse_args()
+
+    build_contracts()
+    drifted = []
+    for abi_path in sorted(ABI_DIR.glob("*.json")):
+        name = abi_path.stem
+        compiled_path = CONTRACTS_DIR / "out" / f"{name}.sol" / f"{name}.json"
+        if not compiled_path.exists():
+            print(f"{name:<20} no forge artifact, skipped")
+            continue
+
+        with open(abi_path) as f:
+            artifact = json.load(f)
+        with open(compiled_path) as f:
+            compiled_abi = json.load(f)["abi"]
+        if _canonical(artifact["abi"]) == _canonical(compiled_abi):
+            print(f"{name:<20} ok")
+            continue
+
+        drifted.append(name)
+        print(f"{name:<20} {'updated' if args.write else 'DIFFERS'}")
+        if args.write:
+            artifact["abi"] = compiled_abi
+            with open(abi_path, "w") as f:
+                json.dump(artifact, f, indent=2)
+                f.write("\n")
+
+    sys.exit(1 if drifted and not args.write else 0)
+
+if __name__ == "__main__":
+    main()
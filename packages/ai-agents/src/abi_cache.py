@@ -0,0 +1,55 @@
+import json
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+from sqlite_store import data_path
+
+ABI_DIR = Path(__file__).parent / 'abi'
+
+def _pickle_enabled() -> bool:
+    return os.getenv("ABI_PICKLE_CACHE", "true").lower() == "true"
+
+@lru_cache(maxsize=None)
+def load_abi(contract_name: str) -> list:
+    """Load a contract ABI once per process
+
+    The artifacts in src/abi carry bytecode next to the ABI, so the ABI alone
+    is also pickled under the agents' data directory and reused by later
+    processes until the artifact changes.
+    """
+    abi_path = ABI_DIR / f'{contract_name}.json'
+    try:
+        stat = abi_path.stat()
+    except OSError as e:
+        raise Exception(f"Failed to load ABI for {contract_name}: {str(e)}")
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    pickle_path = Path(os.getenv("ABI_CACHE_DIR") or data_path("abi")) / f'{contract_name}.pickle'
+    if _pickle_enabled():
+        try:
+            with open(pickle_path, 'rb') as f:
+                cached_version, abi = pickle.load(f)
+            if cached_version == version:
+                return abi
+        except Exception:
+            pass
+
+    print(f"Loading ABI from: {abi_path}")
+    try:
+        with open(abi_path) as f:
+            abi = json.load(f)['abi']
+    except Exception as e:
+        raise Exception(f"Failed to load ABI for {contract_name}: {str(e)}")
+
+    if _pickle_enabled():
+        try:
+            pickle_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = pickle_path.parent / f'{contract_name}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((version, abi), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, pickle_path)
+        except OSError as e:
+            print(f"Could not write ABI cache for {contract_name}: {str(e)}")
+    return abi
@@ -1,17 +1,46 @@
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
 import os
 from dotenv import load_dotenv
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Iterable, Tuple
+import asyncio
 import json
+import random
+import time
+import metrics
+from analysis_cache import AnalysisCache
+from rate_limiter import TokenBudgetLimiter
+from single_flight import SingleFlight
+
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to a character-based estimate
+    tiktoken = None
 
 class EnhancedDeveloperAnalyzer:
-    def __init__(self):
+    SYSTEM_PROMPT = "You are an AI talent scout analyzing developer profiles for web3/blockchain potential. Focus on evidence of real development skills and contributions."
+
+    def __init__(self, cache: AnalysisCache = None):
         load_dotenv()
         self.client = AsyncOpenAI(
             api_key=os.getenv("OPENAI_API_KEY")
         )
         self.model = "gpt-4-0125-preview"
 
+        # Unchanged profiles produce the same prompt and reuse the stored analysis
+        if cache is None and os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() != "false":
+            cache = AnalysisCache()
+        self.cache = cache
+
+        # Batch analysis limits; defaults match a low OpenAI usage tier
+        self.max_concurrency = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+        self.requests_per_minute = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+        self.tokens_per_minute = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "30000"))
+        self.completion_token_estimate = int(os.getenv("OPENAI_COMPLETION_TOKEN_ESTIMATE", "800"))
+        self.max_retries = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+
+        # Identical prompts in flight at the same time share one completion
+        self._flights = SingleFlight()
+
     def _create_skill_tags(self, repositories: List[Dict]) -> List[str]:
         """Extract relevant skills from repositories"""
         try:
@@ -33,7 +62,8 @@ class EnhancedDeveloperAnalyzer:
                 }
                 skills.update(tech for tech in common_techs if tech in desc)
             
-            return list(skills)
+            # Sorted so the prompt, and its cache key, is stable across runs
+            return sorted(skills)
         except Exception as e:
             print(f"Error in _create_skill_tags: {str(e)}")
             return []
@@ -70,6 +100,12 @@ class EnhancedDeveloperAnalyzer:
             initial_reputation = self._calculate_initial_reputation(dev_data)
             
             basic_info = dev_data['basic_info']
+            repo_lines = chr(10).join([
+                f'- {repo.get("name", "Unknown")}: {repo.get("stars", 0)} stars\n'
+                f'  Description: {repo.get("description", "N/A")}\n'
+                f'  Languages: {", ".join(repo.get("languages", {}).keys()) if repo.get("languages") else "N/A"}'
+                for repo in dev_data.get("repositories", [])
+            ])
             return f"""Analyze this developer's profile for talent discovery, focusing on web3/blockchain potential:
 
 PROFILE:
@@ -81,7 +117,7 @@ Initial Reputation Score: {initial_reputation}
 Identified Skills: {', '.join(skills) if skills else 'None identified'}
 
 REPOSITORIES:
-{chr(10).join([f'- {repo.get("name", "Unknown")}: {repo.get("stars", 0)} stars\n  Description: {repo.get("description", "N/A")}\n  Languages: {", ".join(repo.get("languages", {}).keys()) if repo.get("languages") else "N/A"}' for repo in dev_data.get("repositories", [])])}
+{repo_lines}
 
 Please analyze this developer's potential and provide a response in JSON format with the following fields:
 - confidence_score: number from 0-100
@@ -103,41 +139,178 @@ Please analyze this developer's potential and provide a response in JSON format
             print(f"Error in _create_analysis_prompt: {str(e)}")
             raise
 
-    async def analyze_developer(self, dev_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_developer(self, dev_data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
         try:
             if not dev_data:
                 print("Developer data is None")
                 return None
                 
             analysis_prompt = self._create_analysis_prompt(dev_data)
-            
-            completion = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an AI talent scout analyzing developer profiles for web3/blockchain potential. Focus on evidence of real development skills and contributions."
-                    },
-                    {
-                        "role": "user", 
-                        "content": analysis_prompt
-                    }
-                ],
-                response_format={ "type": "json_object" }
-            )
-            
-            analysis = json.loads(completion.choices[0].message.content)
-            
-            # Add metadata
-            analysis["analyzed_at"] = dev_data["basic_info"].get("account_created")
-            analysis["github_url"] = f"https://github.com/{dev_data['basic_info'].get('username')}"
-            analysis["initial_skills"] = self._create_skill_tags(dev_data.get("repositories", []))
-            
-            return analysis
+            key = (use_cache, AnalysisCache.make_key(self.model, self.SYSTEM_PROMPT, analysis_prompt))
+            analysis = await self._flights.do(key, self._get_or_create_analysis, analysis_prompt, use_cache)
+
+            # Coalesced callers get their own copy to attach metadata to
+            return self._add_metadata(dict(analysis), dev_data)
 
         except Exception as e:
             print(f"Error in analyze_developer: {str(e)}")
             return None
 
+    async def _get_or_create_analysis(self, analysis_prompt: str, use_cache: bool) -> Dict[str, Any]:
+        analysis = self._get_cached_analysis(analysis_prompt, use_cache)
+        if analysis is not None:
+            return analysis
+
+        completion = await self._create_completion(self.client, analysis_prompt)
+
+        analysis = json.loads(completion.choices[0].message.content)
+        self._store_analysis(analysis_prompt, analysis)
+        return analysis
+
+    async def analyze_many(self, profiles: Iterable[Dict[str, Any]], use_cache: bool = True,
+                           max_concurrency: int = None, requests_per_minute: int = None,
+                           tokens_per_minute: int = None) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Analyze many profiles concurrently, yielding (dev_data, analysis) as each completes
+
+        Completions are paced under the requests- and tokens-per-minute limits
+        using an estimate of each prompt's size, and retried with jittered
+        backoff on 429 and 5xx responses. analysis is None for profiles that
+        could not be analyzed.
+        """
+        limiter = TokenBudgetLimiter(
+            requests_per_minute or self.requests_per_minute,
+            tokens_per_minute or self.tokens_per_minute
+        )
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        # Retries are handled here so the limiter sees every attempt
+        client = self.client.with_options(max_retries=0)
+
+        tasks = [
+            asyncio.create_task(self._analyze_with_budget(dev_data, use_cache, client, limiter, semaphore))
+            for dev_data in profiles
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _analyze_with_budget(self, dev_data: Dict[str, Any], use_cache: bool, client: AsyncOpenAI,
+                                   limiter: TokenBudgetLimiter, semaphore: asyncio.Semaphore):
+        try:
+            if not dev_data:
+                return dev_data, None
+
+            analysis_prompt = self._create_analysis_prompt(dev_data)
+            analysis = self._get_cached_analysis(analysis_prompt, use_cache)
+            if analysis is not None:
+                return dev_data, self._add_metadata(analysis, dev_data)
+
+            estimated_tokens = self._estimate_tokens(self.SYSTEM_PROMPT + analysis_prompt) + self.completion_token_estimate
+            async with semaphore:
+                for attempt in range(self.max_retries + 1):
+                    await limiter.acquire(estimated_tokens)
+                    try:
+                        completion = await self._create_completion(client, analysis_prompt)
+                        break
+                    except (RateLimitError, APIStatusError, APIConnectionError) as e:
+                        status = getattr(e, "status_code", None)
+                        retryable = isinstance(e, (RateLimitError, APIConnectionError)) or (status or 0) >= 500
+                        if not retryable or attempt == self.max_retries:
+                            raise
+
+                        delay = self._retry_delay(e, attempt)
+                        if isinstance(e, RateLimitError):
+                            limiter.pause(delay)
+                        print(f"OpenAI request failed ({status or type(e).__name__}), retrying in {delay:.1f}s...")
+                        await asyncio.sleep(delay)
+
+            if completion.usage:
+                limiter.settle(estimated_tokens, completion.usage.total_tokens)
+
+            analysis = json.loads(completion.choices[0].message.content)
+            self._store_analysis(analysis_prompt, analysis)
+            return dev_data, self._add_metadata(analysis, dev_data)
+
+        except Exception as e:
+            username = (dev_data or {}).get("basic_info", {}).get("username")
+            print(f"Error analyzing {username}: {str(e)}")
+            return dev_data, None
+
+    async def _create_completion(self, client: AsyncOpenAI, analysis_prompt: str):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            completion = await self._request_completion(client, analysis_prompt)
+            status = 200
+        except APIStatusError as e:
+            status = e.status_code
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.OPENAI_REQUESTS.labels(model=self.model, status=status).inc()
+            metrics.OPENAI_REQUEST_SECONDS.labels(model=self.model).observe(elapsed)
+            metrics.TRACE.record("openai", self.model, elapsed, status=status)
+
+        if completion.usage:
+            metrics.OPENAI_TOKENS.labels(model=self.model, kind="prompt").inc(completion.usage.prompt_tokens)
+            metrics.OPENAI_TOKENS.labels(model=self.model, kind="completion").inc(completion.usage.completion_tokens)
+        return completion
+
+    async def _request_completion(self, client: AsyncOpenAI, analysis_prompt: str):
+        return await client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system", 
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user", 
+                    "content": analysis_prompt
+                }
+            ],
+            response_format={ "type": "json_object" }
+        )
+
+    def _get_cached_analysis(self, analysis_prompt: str, use_cache: bool) -> Dict[str, Any]:
+        if not self.cache or not use_cache:
+            return None
+        return self.cache.get(self.cache.make_key(self.model, self.SYSTEM_PROMPT, analysis_prompt))
+
+    def _store_analysis(self, analysis_prompt: str, analysis: Dict[str, Any]):
+        # Bypassed calls still refresh the entry so it stays current
+        if self.cache:
+            key = self.cache.make_key(self.model, self.SYSTEM_PROMPT, analysis_prompt)
+            self.cache.store(key, self.model, dict(analysis))
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Prompt size in tokens, exact with tiktoken or roughly 4 characters per token"""
+        if tiktoken is not None:
+            try:
+                return len(tiktoken.encoding_for_model(self.model).encode(text))
+            except Exception:
+                pass
+        return len(text) // 4 + 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Server-provided Retry-After if present, else jittered exponential backoff"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return min(60.0, 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _add_metadata(self, analysis: Dict[str, Any], dev_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach profile metadata to a raw model analysis"""
+        analysis["analyzed_at"] = dev_data["basic_info"].get("account_created")
+        analysis["github_url"] = f"https://github.com/{dev_data['basic_info'].get('username')}"
+        analysis["initial_skills"] = self._create_skill_tags(dev_data.get("repositories", []))
+        return analysis
+
 # For backward compatibility
 DeveloperAnalyzer = EnhancedDeveloperAnalyzer
\ No newline at end of file
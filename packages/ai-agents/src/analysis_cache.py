@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, Any, Optional
+
+from sqlite_store import SQLiteStore, data_path
+
+class AnalysisCache(SQLiteStore):
+    """Persistent cache of LLM analyses keyed by a hash of the exact request
+
+    The key covers the model, the system prompt and the whitespace-normalized
+    analysis prompt, so any change in the developer's profile data produces
+    a new key and a fresh completion.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS analyses (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            analysis TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS analyses_accessed_at ON analyses (accessed_at);
+    """
+
+    def __init__(self, path: str = None, ttl: float = None, max_entries: int = None):
+        super().__init__(path or os.getenv("ANALYSIS_CACHE_PATH") or data_path("analysis_cache.sqlite"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("ANALYSIS_CACHE_TTL", str(30 * 24 * 3600)))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str) -> str:
+        normalized = re.sub(r"\s+", " ", prompt).strip()
+        payload = json.dumps([model, system_prompt, normalized])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis, or None if missing or older than the TTL"""
+        row = self.fetchone("SELECT analysis, created_at FROM analyses WHERE key = ?", (key,))
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row["created_at"] > self.ttl:
+            self.execute("DELETE FROM analyses WHERE key = ?", (key,))
+            return None
+
+        self.execute("UPDATE analyses SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row["analysis"])
+
+    def store(self, key: str, model: str, analysis: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self.execute(
+                "INSERT OR REPLACE INTO analyses (key, model, analysis, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(analysis), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones over the size limit"""
+        self.execute("DELETE FROM analyses WHERE created_at < ?", (time.time() - self.ttl,))
+        count = self.fetchone("SELECT COUNT(*) FROM analyses")[0]
+        if count > self.max_entries:
+            self.execute(
+                "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
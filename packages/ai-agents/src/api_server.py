@@ -1,17 +1,85 @@
 # packages/ai-agents/src/api_server.py
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from validator_agent import ValidatorAgent
+from jobs import JobManager
+import metrics
+import json
 from typing import Dict, Any
+from contextlib import asynccontextmanager
+import asyncio
+import os
 import uvicorn
 
-app = FastAPI()
+# Cheap to construct: its clients and contracts are created on first request
 validator = ValidatorAgent()
 
-@app.post("/validate")
+# Validations run in the background; identical requests share one job
+# and finished results are served again until they expire
+validation_jobs = JobManager(validator.validate_user)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optionally keep the local registry mirror tailing the chain
+    indexer_task = None
+    if os.getenv("REGISTRY_INDEXER_RUN", "false").lower() == "true" and validator.contract.indexer is not None:
+        indexer_task = asyncio.create_task(validator.contract.indexer.run())
+    yield
+    if indexer_task is not None:
+        indexer_task.cancel()
+    await validation_jobs.aclose()
+    await validator.aclose()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request, latency and budget metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/validate", status_code=202)
 async def validate_developer(github_username: str, wallet_address: str) -> Dict[str, Any]:
+    key = (github_username.lower(), wallet_address.lower())
+    job = validation_jobs.submit(key, github_username, wallet_address)
+    return job.to_dict()
+
+@app.get("/validate/{job_id}")
+async def get_validation(job_id: str) -> Dict[str, Any]:
+    job = validation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job.to_dict()
+
+@app.get("/validate/{job_id}/events")
+async def stream_validation(job_id: str) -> StreamingResponse:
+    job = validation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+
+    async def events():
+        async for event in job.stream():
+            yield f"event: {event['status']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/registry/{github_username}")
+async def get_registration(github_username: str) -> Dict[str, Any]:
+    try:
+        contract = validator.contract
+        return {
+            "github_username": github_username,
+            "registered": await contract.check_if_registered(github_username),
+            "developer_address": contract.index.developer_for_username(github_username) if contract.index else None,
+            "token_address": await contract.get_token_for_username(github_username)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/registry/developer/{developer_address}/token")
+async def get_developer_token(developer_address: str) -> Dict[str, Any]:
     try:
-        result = await validator.validate_user(github_username, wallet_address)
-        return result
+        token_address = await validator.contract.get_token_for_developer(developer_address)
+        return {"developer_address": developer_address, "token_address": token_address}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,99 +1,221 @@
 import asyncio
-from github_client import GitHubClient
+from github_graphql import create_github_client
 from ai_analyzer import EnhancedDeveloperAnalyzer
 from contract_integrator import EnhancedContractIntegrator
-from eth_account import Account
+from pipeline import Pipeline
+from developer_snapshots import DeveloperRefresher
+from prescoring import Prescorer
 import json
+from functools import cached_property
+import os
 from datetime import datetime
+from typing import List
 
 class AutoRegistrationAgent:
     def __init__(self):
-        self.github = GitHubClient()
-        self.analyzer = EnhancedDeveloperAnalyzer()
-        self.contract = EnhancedContractIntegrator()
-        
         self.min_confidence_score = 65  # Lowered threshold to include more developers
         self.max_registrations = 5
-        
+        self.discovery_limit = 20
+
+        # Worker counts per pipeline stage; transactions are submitted by a
+        # single worker while receipts are awaited concurrently
+        self.check_batch_size = int(os.getenv("PIPELINE_CHECK_BATCH_SIZE", "50"))
+        self.check_batch_wait = float(os.getenv("PIPELINE_CHECK_BATCH_WAIT", "0.5"))
+        self.fetch_workers = int(os.getenv("PIPELINE_FETCH_WORKERS", "4"))
+        self.fetch_batch_size = int(os.getenv("PIPELINE_FETCH_BATCH_SIZE", "5"))
+        self.fetch_batch_wait = float(os.getenv("PIPELINE_FETCH_BATCH_WAIT", "0.5"))
+        self.analyze_workers = int(os.getenv("PIPELINE_ANALYZE_WORKERS", "3"))
+        self.confirm_workers = int(os.getenv("PIPELINE_CONFIRM_WORKERS", "4"))
+        self.queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", "10"))
+
+        # Refresh known developers from their snapshots instead of re-crawling
+        # and re-scoring them on every run
+        self.incremental_refresh = os.getenv("INCREMENTAL_REFRESH_ENABLED", "false").lower() == "true"
+
+        # Rank fetched profiles in batches and only send the promising ones
+        # to the LLM; top_k caps how many of each batch go through
+        self.prescore_enabled = os.getenv("PRESCORE_ENABLED", "false").lower() == "true"
+        self.prescore_batch_size = int(os.getenv("PIPELINE_PRESCORE_BATCH_SIZE", "20"))
+        self.prescore_batch_wait = float(os.getenv("PIPELINE_PRESCORE_BATCH_WAIT", "1.0"))
+        self.prescore_top_k = int(os.getenv("PRESCORE_TOP_K")) if os.getenv("PRESCORE_TOP_K") else None
+
+        # Register qualified candidates as cohorts through registerDevelopers,
+        # one transaction per REGISTRATION_BATCH_SIZE developers
+        self.batch_registration = os.getenv("PIPELINE_BATCH_REGISTRATION", "false").lower() == "true"
+        self.register_batch_wait = float(os.getenv("PIPELINE_REGISTER_BATCH_WAIT", "5.0"))
+
+    async def _discover_candidates(self):
+        """Discovery stage: streams candidate usernames as they qualify"""
+        async for username in self.github.iter_web3_developers(limit=self.discovery_limit):
+            yield username
+
+    async def _check_stage(self, usernames: List[str]) -> List[str]:
+        """Drop candidates that are already registered on-chain, a batch at a time"""
+        self._candidates.extend(usernames)
+        registered = await self.contract.check_many_registered(usernames)
+        for username in usernames:
+            if registered.get(username):
+                print(f"{username} is already registered")
+        return [username for username in usernames if not registered.get(username)]
+
+    async def _fetch_stage(self, usernames: List[str]):
+        """Fetch GitHub data for a batch of candidates, several profiles per request where the backend allows"""
+        for username in usernames:
+            print(f"\nAnalyzing {username}...")
+        if self.incremental_refresh:
+            # Snapshots are refreshed one developer at a time
+            results = await asyncio.gather(*(self.refresher.refresh_data(username) for username in usernames))
+            profiles = dict(zip(usernames, results))
+        else:
+            profiles = await self.github.get_developers_data(usernames)
+
+        items = []
+        for username in usernames:
+            dev_data = profiles.get(username)
+            if not dev_data:
+                print(f"Could not fetch data for {username}")
+                continue
+            items.append((username, dev_data))
+        return items
+
+    async def _prescore_stage(self, items):
+        """Drop candidates whose cheap score says the LLM would reject them"""
+        return self.prescorer.filter(items, self.prescore_top_k)
+
+    async def _analyze_stage(self, item):
+        """Score a candidate and keep those that meet the criteria"""
+        username, dev_data = item
+        if self.incremental_refresh:
+            analysis = await self.refresher.analyze(username, dev_data)
+        else:
+            analysis = await self.analyzer.analyze_developer(dev_data)
+        if not analysis:
+            print(f"Could not analyze {username}")
+            return None
+
+        print(f"\nAnalysis complete for {username}:")
+        print(f"Confidence Score: {analysis['confidence_score']}")
+        print(f"Skill Relevance: {analysis['skills_assessment']['skill_relevance_score']}")
+        print("Validated Skills:", ", ".join(analysis['skills_assessment'].get('validated_skills', [])[:5]))
+
+        if analysis['confidence_score'] < self.min_confidence_score:
+            print(f"\n{username} does not meet minimum criteria")
+            print(f"Score {analysis['confidence_score']} below threshold {self.min_confidence_score}")
+            return None
+        return username, analysis
+
+    async def _submit_stage(self, item):
+        """Broadcast registrations one at a time without waiting for them to be mined"""
+        username, analysis = item
+
+        # Count in-flight registrations against the cap; a failed one frees its slot
+        async with self._slots:
+            await self._slots.wait_for(
+                lambda: len(self._results) + self._in_flight < self.max_registrations
+            )
+            self._in_flight += 1
+
+        print(f"\n{username} meets criteria. Attempting registration...")
+        try:
+            pending, developer_address = await self.contract.submit_registration(username, analysis)
+        except Exception as e:
+            print(f"Failed to register {username}: {str(e)}")
+            await self._release_slot()
+            return None
+        return username, analysis, developer_address, pending
+
+    async def _confirm_stage(self, item):
+        """Wait for a submitted registration and stop once the cap is reached"""
+        username, analysis, developer_address, pending = item
+        try:
+            result = await self.contract.complete_registration(username, developer_address, pending)
+
+            if result['success']:
+                print(f"Successfully registered {username}")
+                self._results.append({
+                    'username': username,
+                    'developer_address': result['developer_address'],
+                    'token_address': result['token_address'],
+                    'analysis': analysis,
+                    'transaction_hash': result['transaction_hash']
+                })
+                if len(self._results) >= self.max_registrations:
+                    self._pipeline.stop()
+            else:
+                print(f"Failed to register {username}: {result.get('error')}")
+        finally:
+            await self._release_slot()
+        return None
+
+    async def _register_stage(self, items):
+        """Register a cohort of qualified candidates, up to the remaining cap"""
+        items = items[:self.max_registrations - len(self._results)]
+        if not items:
+            return []
+
+        print(f"\nRegistering cohort of {len(items)}: {', '.join(username for username, _ in items)}")
+        results = await self.contract.register_developers(items)
+        for username, analysis in items:
+            result = results.get(username, {})
+            if result.get('success'):
+                print(f"Successfully registered {username}")
+                self._results.append({
+                    'username': username,
+                    'developer_address': result['developer_address'],
+                    'token_address': result['token_address'],
+                    'analysis': analysis,
+                    'transaction_hash': result['transaction_hash']
+                })
+            else:
+                print(f"Failed to register {username}: {result.get('error')}")
+
+        if len(self._results) >= self.max_registrations:
+            self._pipeline.stop()
+        return []
+
+    async def _release_slot(self):
+        async with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
     async def discover_and_register(self):
         print("Starting developer discovery and registration process...")
         
         try:
-            # Discover potential developers
-            potential_developers = await self.github.discover_web3_developers(limit=20)
-            print(f"Found {len(potential_developers)} potential developers\n")
-            
             print("Developer Evaluation Criteria:")
             print(f"- Minimum confidence score: {self.min_confidence_score}")
             print(f"- Maximum registrations: {self.max_registrations}\n")
-            
-            registrations = 0
-            results = []
-            
-            for username in potential_developers:
-                if registrations >= self.max_registrations:
-                    break
-                    
-                print(f"\nAnalyzing {username}...")
-                
-                try:
-                    # Check if already registered
-                    is_registered = await self.contract.check_if_registered(username)
-                    if is_registered:
-                        print(f"{username} is already registered")
-                        continue
-                    
-                    # Get GitHub data
-                    dev_data = await self.github.get_developer_data(username)
-                    if not dev_data:
-                        print(f"Could not fetch data for {username}")
-                        continue
-                    
-                    # Analyze developer
-                    analysis = await self.analyzer.analyze_developer(dev_data)
-                    if not analysis:
-                        print(f"Could not analyze {username}")
-                        continue
-                    
-                    print(f"\nAnalysis complete for {username}:")
-                    print(f"Confidence Score: {analysis['confidence_score']}")
-                    print(f"Skill Relevance: {analysis['skills_assessment']['skill_relevance_score']}")
-                    print("Validated Skills:", ", ".join(analysis['skills_assessment'].get('validated_skills', [])[:5]))
-                    
-                    if analysis['confidence_score'] >= self.min_confidence_score:
-                        print(f"\n{username} meets criteria. Attempting registration...")
-                        
-                        # Register developer
-                        result = await self.contract.register_developer(
-                            username,
-                            analysis
-                        )
-                        
-                        if result['success']:
-                            print(f"Successfully registered {username}")
-                            registrations += 1
-                            
-                            results.append({
-                                'username': username,
-                                'developer_address': result['developer_address'],
-                                'token_address': result['token_address'],
-                                'analysis': analysis,
-                                'transaction_hash': result['transaction_hash']
-                            })
-                        else:
-                            print(f"Failed to register {username}: {result.get('error')}")
-                    else:
-                        print(f"\n{username} does not meet minimum criteria")
-                        print(f"Score {analysis['confidence_score']} below threshold {self.min_confidence_score}")
-                        
-                except Exception as e:
-                    print(f"Error processing {username}: {str(e)}")
-                    continue
-            
+
+            self._candidates = []
+            self._results = []
+            self._in_flight = 0
+            self._slots = asyncio.Condition()
+            self._pipeline = (
+                Pipeline(queue_size=self.queue_size)
+                .add_batch_stage("check", self._check_stage, batch_size=self.check_batch_size, max_wait=self.check_batch_wait)
+                .add_batch_stage("fetch", self._fetch_stage, batch_size=self.fetch_batch_size,
+                                 max_wait=self.fetch_batch_wait, workers=self.fetch_workers)
+            )
+            if self.prescore_enabled:
+                self._pipeline.add_batch_stage("prescore", self._prescore_stage, batch_size=self.prescore_batch_size,
+                                               max_wait=self.prescore_batch_wait)
+            self._pipeline.add_stage("analyze", self._analyze_stage, workers=self.analyze_workers)
+            if self.batch_registration:
+                self._pipeline.add_batch_stage("register", self._register_stage,
+                                               batch_size=self.contract.registration_batch_size,
+                                               max_wait=self.register_batch_wait)
+            else:
+                self._pipeline.add_stage("submit", self._submit_stage, workers=1)
+                self._pipeline.add_stage("confirm", self._confirm_stage, workers=self.confirm_workers)
+            await self._pipeline.run(self._discover_candidates())
+            results = self._results
+
             # Print summary
             print("\n=== Registration Summary ===")
-            print(f"Total developers analyzed: {len(potential_developers)}")
+            print(f"Total developers analyzed: {len(self._candidates)}")
             print(f"Successful registrations: {len(results)}")
+            for stage, stats in self._pipeline.stats().items():
+                print(f"- {stage}: {stats['processed']} processed, {stats['mean_seconds']:.2f}s mean, {stats['max_seconds']:.2f}s max")
             
             if results:
                 # Save detailed results
@@ -101,7 +223,7 @@ class AutoRegistrationAgent:
                     'timestamp': datetime.now().isoformat(),
                     'registrations': results,
                     'summary': {
-                        'total_attempted': len(potential_developers),
+                        'total_attempted': len(self._candidates),
                         'successful': len(results),
                         'average_confidence': sum(r['analysis']['confidence_score'] for r in results) / len(results) if results else 0
                     }
@@ -116,9 +238,42 @@ class AutoRegistrationAgent:
             print(f"Error in discover_and_register: {str(e)}")
             return []
 
+    # Clients are built on first use, so agents are cheap to construct and
+    # a command that never touches the chain never loads the contracts
+
+    @cached_property
+    def github(self):
+        return create_github_client()
+
+    @cached_property
+    def analyzer(self) -> EnhancedDeveloperAnalyzer:
+        return EnhancedDeveloperAnalyzer()
+
+    @cached_property
+    def contract(self) -> EnhancedContractIntegrator:
+        return EnhancedContractIntegrator()
+
+    @cached_property
+    def prescorer(self) -> Prescorer:
+        return Prescorer()
+
+    @cached_property
+    def refresher(self) -> DeveloperRefresher:
+        return DeveloperRefresher(self.github, self.analyzer)
+
+    async def aclose(self):
+        """Release pooled connections held by the agent's clients"""
+        if 'github' in self.__dict__:
+            await self.github.aclose()
+        if 'contract' in self.__dict__:
+            await self.contract.aclose()
+
 async def main():
     agent = AutoRegistrationAgent()
-    await agent.discover_and_register()
+    try:
+        await agent.discover_and_register()
+    finally:
+        await agent.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,33 +1,176 @@
-from web3 import Web3
+from web3 import AsyncWeb3
 from eth_account import Account
+import aiohttp
+import asyncio
 import os
+import time
 from dotenv import load_dotenv
-import json
-from typing import Dict, Any, List
-from pathlib import Path
+from functools import cached_property
+from typing import Dict, Any, List, Optional, Tuple
+from abi_cache import load_abi
+from tx_manager import TransactionManager, PendingTransaction
+from registry_indexer import RegistryIndex, RegistryIndexer
+from event_decoder import DecodedEvent, EventDecoder
+import metrics
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+MULTICALL3_ABI = [{
+    'name': 'aggregate3',
+    'type': 'function',
+    'stateMutability': 'payable',
+    'inputs': [{
+        'name': 'calls',
+        'type': 'tuple[]',
+        'components': [
+            {'name': 'target', 'type': 'address'},
+            {'name': 'allowFailure', 'type': 'bool'},
+            {'name': 'callData', 'type': 'bytes'}
+        ]
+    }],
+    'outputs': [{
+        'name': 'returnData',
+        'type': 'tuple[]',
+        'components': [
+            {'name': 'success', 'type': 'bool'},
+            {'name': 'returnData', 'type': 'bytes'}
+        ]
+    }]
+}]
+
+ZERO_ADDRESS = '0x' + '0' * 40
+
+async def rpc_metrics_middleware(make_request, w3):
+    """Count and time every JSON-RPC request sent through the provider"""
+    async def middleware(method, params):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await make_request(method, params)
+            status = "error" if "error" in response else "ok"
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.RPC_CALLS.labels(method=method, status=status).inc()
+            metrics.RPC_CALL_SECONDS.labels(method=method).observe(elapsed)
+            metrics.TRACE.record("rpc", method, elapsed, status=status)
+    return middleware
 
 class EnhancedContractIntegrator:
     def __init__(self):
         load_dotenv()
-        rpc_url = os.getenv('LENS_RPC_URL', 'https://rpc.testnet.lens.dev')
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
-        if not self.w3.is_connected():
-            raise Exception(f"Failed to connect to {rpc_url}")
+        self.rpc_url = os.getenv('LENS_RPC_URL', 'https://rpc.testnet.lens.dev')
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(
+            self.rpc_url,
+            request_kwargs={'timeout': aiohttp.ClientTimeout(total=float(os.getenv('RPC_TIMEOUT', '30')))}
+        ))
+        self.w3.middleware_onion.add(rpc_metrics_middleware, 'metrics')
+        self.rpc_max_connections = int(os.getenv('RPC_MAX_CONNECTIONS', '20'))
+        self._session: aiohttp.ClientSession = None
+        self._connect_lock = asyncio.Lock()
             
         self.private_key = os.getenv('PRIVATE_KEY')
-        self.account = Account.from_key(self.private_key)
-        
+
         # Contract addresses
         self.registry_address = os.getenv('REGISTRY_ADDRESS')
         self.investment_address = os.getenv('INVESTMENT_ADDRESS')
         self.auto_registration_address = os.getenv('AUTO_REGISTRATION_ADDRESS')
 
-        print("Loading contract ABIs...")
-        self.registry = self._init_contract('TalentRegistry', self.registry_address)
-        self.investment = self._init_contract('Investment', self.investment_address)
-        self.auto_registration = self._init_contract('AutoRegistration', self.auto_registration_address)
-        print("Contract initialization complete")
+        self.multicall_batch_size = int(os.getenv('MULTICALL_BATCH_SIZE', '500'))
+        self.rpc_batch_size = int(os.getenv('RPC_BATCH_SIZE', '100'))
+        self._multicall_available: Optional[bool] = None
+
+        # Registrations per registerDevelopers transaction; each one deploys a token
+        self.registration_batch_size = int(os.getenv('REGISTRATION_BATCH_SIZE', '10'))
+        # registerDevelopers catches failing entries, so the node's estimate
+        # can be low enough to starve some of them; leave extra room
+        self.registration_batch_gas_multiplier = float(os.getenv('REGISTRATION_BATCH_GAS_MULTIPLIER', '1.5'))
+        self._batch_registration_available: Optional[bool] = None
+
+    # Accounts, contracts and stores are built on first use so constructing
+    # the integrator is cheap and never touches the network
+
+    @cached_property
+    def account(self):
+        return Account.from_key(self.private_key)
+
+    @cached_property
+    def tx_manager(self) -> TransactionManager:
+        return TransactionManager(self.w3, self.account)
+
+    @cached_property
+    def registry(self):
+        return self._init_contract('TalentRegistry', self.registry_address)
+
+    @cached_property
+    def investment(self):
+        return self._init_contract('Investment', self.investment_address)
+
+    @cached_property
+    def auto_registration(self):
+        return self._init_contract('AutoRegistration', self.auto_registration_address)
+
+    @cached_property
+    def decoder(self) -> EventDecoder:
+        """One decoder for every log we read, from receipts or eth_getLogs"""
+        return EventDecoder(
+            self.w3.codec,
+            {
+                'TalentRegistry': self.registry.abi,
+                'Investment': self.investment.abi,
+                'AutoRegistration': self.auto_registration.abi,
+                'CreatorToken': self._load_abi('CreatorToken'),
+                'PriceTracker': self._load_abi('PriceTracker'),
+            },
+            {
+                'TalentRegistry': self.registry_address,
+                'Investment': self.investment_address,
+                'AutoRegistration': self.auto_registration_address,
+            }
+        )
+
+    @cached_property
+    def multicall(self):
+        """Batched view calls: Multicall3 when deployed, JSON-RPC batches otherwise"""
+        return self.w3.eth.contract(
+            address=AsyncWeb3.to_checksum_address(os.getenv('MULTICALL3_ADDRESS', MULTICALL3_ADDRESS)),
+            abi=MULTICALL3_ABI
+        )
+
+    # Local event mirror; positive answers are served from it and
+    # anything it doesn't know yet still falls back to the RPC node
+    @cached_property
+    def index(self) -> Optional[RegistryIndex]:
+        if os.getenv('REGISTRY_INDEX_ENABLED', 'true').lower() != 'true':
+            return None
+        return RegistryIndex()
+
+    @cached_property
+    def indexer(self) -> Optional[RegistryIndexer]:
+        if self.index is None:
+            return None
+        return RegistryIndexer(self, self.index)
+
+    async def connect(self):
+        """Open the pooled RPC session and verify the node is reachable"""
+        async with self._connect_lock:
+            if self._session is not None and not self._session.closed:
+                return
+
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.rpc_max_connections)
+            )
+            await self.w3.provider.cache_async_session(session)
+            if not await self.w3.is_connected():
+                await session.close()
+                raise Exception(f"Failed to connect to {self.rpc_url}")
+            self._session = session
+
+    async def aclose(self):
+        """Close the pooled RPC session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     def _init_contract(self, name: str, address: str):
         """Initialize a contract with error handling"""
@@ -40,104 +183,252 @@ class EnhancedContractIntegrator:
 
     def _load_abi(self, contract_name: str) -> list:
         """Load contract ABI from the existing abi folder in src"""
-        try:
-            abi_path = Path(__file__).parent / 'abi' / f'{contract_name}.json'
-            print(f"Loading ABI from: {abi_path}")
-            
-            with open(abi_path) as f:
-                contract_json = json.load(f)
-                return contract_json['abi']
-        except Exception as e:
-            raise Exception(f"Failed to load ABI for {contract_name}: {str(e)}")
+        return load_abi(contract_name)
 
-    def _build_and_send_transaction(self, contract_function, value=0):
-        """Helper method to build and send transactions synchronously"""
+    async def _build_and_send_transaction(self, contract_function, value=0):
+        """Helper method to build, send and wait for a transaction"""
         try:
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
-            gas_price = self.w3.eth.gas_price
-            
-            # Build transaction
-            tx = contract_function.build_transaction({
-                'from': self.account.address,
-                'nonce': nonce,
-                'gas': 1000000,  # High gas limit for contract deployments
-                'gasPrice': gas_price,
-                'value': value
-            })
-
-            # Sign and send
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            print(f"Transaction sent: {tx_hash.hex()}")
-            
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-            print(f"Transaction confirmed in block {receipt.blockNumber}")
-            
-            return receipt
-            
+            await self.connect()
+            pending = await self.tx_manager.send(contract_function, value)
+            return await self.tx_manager.wait(pending)
         except Exception as e:
             raise Exception(f"Transaction failed: {str(e)}")
 
-    def _get_token_from_investment_event(self, receipt):
+    def _get_token_from_investment_event(self, events: List[DecodedEvent]):
         """Get token address from TokenCreated event in Investment contract"""
-        try:
-            # Process Investment contract logs for TokenCreated event
-            token_created_event = self.investment.events.TokenCreated()
-            
-            for log in receipt.logs:
-                try:
-                    parsed_log = token_created_event.process_receipt(receipt, errors=self.w3.logs.DISCARD)[0]
-                    if parsed_log:
-                        return parsed_log.args.tokenAddress
-                except:
-                    continue
-            
-            return None
-        except Exception as e:
-            print(f"Error getting token from investment event: {str(e)}")
-            return None
+        for event in events:
+            if event.name == 'TokenCreated' and event.contract == 'Investment':
+                return event.args['tokenAddress']
+        return None
 
-    def _get_token_from_registry(self, developer_address):
+    async def _get_token_from_registry(self, developer_address):
         """Get token address from registry as fallback"""
         try:
-            developer_data = self.registry.functions.developers(developer_address).call()
-            return developer_data[3] if developer_data[3] != '0x' + '0' * 40 else None
+            developer_data = await self.registry.functions.developers(developer_address).call()
+            return developer_data[3] if developer_data[3] != ZERO_ADDRESS else None
         except Exception as e:
             print(f"Error getting token from registry: {str(e)}")
             return None
 
     async def register_developer(self,
                                github_username: str,
-                               analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+                               analysis_results: Dict[str, Any],
+                               developer_address: str = None) -> Dict[str, Any]:
         """Register a developer with enhanced data from analysis"""
         try:
-            # Create developer wallet
-            developer_wallet = Account.create()
-            developer_address = developer_wallet.address
-
-            print(f"Registering developer {github_username} with address {developer_address}")
-
-            # Get token params from analysis or use defaults
-            token_name = analysis_results.get('market_metrics', {}).get('suggested_token_name', f"{github_username}Token")
-            token_symbol = analysis_results.get('market_metrics', {}).get('suggested_token_symbol', f"${github_username[:4].upper()}")
-
-            # Register through AutoRegistration contract
-            register_function = self.auto_registration.functions.registerDeveloper(
-                github_username,
-                token_name,
-                token_symbol,
-                developer_address
+            pending, developer_address = await self.submit_registration(
+                github_username, analysis_results, developer_address
             )
-            
-            receipt = self._build_and_send_transaction(register_function)
+        except Exception as e:
+            print(f"Error during registration: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        return await self.complete_registration(github_username, developer_address, pending)
+
+    async def submit_registration(self,
+                                  github_username: str,
+                                  analysis_results: Dict[str, Any],
+                                  developer_address: str = None) -> Tuple[PendingTransaction, str]:
+        """Broadcast a registerDeveloper transaction without waiting for it to be mined"""
+        await self.connect()
+
+        github_username, token_name, token_symbol, developer_address = self._registration_params(
+            github_username, analysis_results, developer_address
+        )
+        print(f"Registering developer {github_username} with address {developer_address}")
+
+        # Register through AutoRegistration contract
+        register_function = self.auto_registration.functions.registerDeveloper(
+            github_username,
+            token_name,
+            token_symbol,
+            developer_address
+        )
+
+        try:
+            pending = await self.tx_manager.send(register_function)
+        except Exception as e:
+            raise Exception(f"Transaction failed: {str(e)}")
+        return pending, developer_address
+
+    def _registration_params(self,
+                             github_username: str,
+                             analysis_results: Dict[str, Any],
+                             developer_address: str = None) -> Tuple[str, str, str, str]:
+        # Create a developer wallet unless the developer brought their own
+        if developer_address is None:
+            developer_address = Account.create().address
+        else:
+            developer_address = AsyncWeb3.to_checksum_address(developer_address)
+
+        # Get token params from analysis or use defaults
+        token_name = analysis_results.get('market_metrics', {}).get('suggested_token_name', f"{github_username}Token")
+        token_symbol = analysis_results.get('market_metrics', {}).get('suggested_token_symbol', f"${github_username[:4].upper()}")
+        return github_username, token_name, token_symbol, developer_address
+
+    async def register_developers(self,
+                                  registrations: List[Tuple]) -> Dict[str, Dict[str, Any]]:
+        """Register a cohort of (github_username, analysis[, developer_address]) entries, many per transaction
+
+        Entries are sent to AutoRegistration.registerDevelopers in chunks of
+        REGISTRATION_BATCH_SIZE; every chunk is broadcast before any receipt
+        is awaited. Per-username results, in the shape register_developer
+        returns, are read from the DeveloperAutoRegistered and
+        DeveloperRegistrationFailed logs. Contracts deployed without the
+        batch entrypoint get pipelined single registrations instead.
+        """
+        if not registrations:
+            return {}
+        await self.connect()
+
+        if not await self._has_batch_registration():
+            return await self._register_individually(registrations)
+
+        entries = [self._registration_params(*registration) for registration in registrations]
+        chunks = [entries[i:i + self.registration_batch_size]
+                  for i in range(0, len(entries), self.registration_batch_size)]
+
+        submitted = []
+        for chunk in chunks:
+            print(f"Registering batch of {len(chunk)} developers: {', '.join(entry[0] for entry in chunk)}")
+            try:
+                pending = await self.tx_manager.send(self.auto_registration.functions.registerDevelopers(chunk),
+                                                     gas_multiplier=self.registration_batch_gas_multiplier)
+                submitted.append((chunk, pending, None))
+            except Exception as e:
+                submitted.append((chunk, None, f"Transaction failed: {str(e)}"))
+
+        results = {}
+        for chunk, pending, error in submitted:
+            if error is None:
+                try:
+                    receipt = await self.tx_manager.wait(pending)
+                    if receipt.status == 1:
+                        results.update(self._batch_results(chunk, receipt))
+                        continue
+                    error = 'Transaction failed'
+                except Exception as e:
+                    error = f"Transaction failed: {str(e)}"
+
+            print(f"Batch registration failed: {error}")
+            for github_username, *_ in chunk:
+                results[github_username] = {'success': False, 'error': error}
+        return results
+
+    def _batch_results(self, chunk: List[Tuple[str, str, str, str]], receipt) -> Dict[str, Dict[str, Any]]:
+        """Per-entry outcome of a registerDevelopers receipt"""
+        events = self.decoder.decode_receipt(receipt)
+        if self.indexer is not None:
+            self.indexer.ingest_events(events)
+
+        outcomes = {}
+        out_of_gas = False
+        for event in events:
+            if event.contract != 'AutoRegistration':
+                continue
+            if event.name == 'DeveloperAutoRegistered':
+                outcomes[event.args['githubUsername']] = {
+                    'success': True,
+                    'transaction_hash': receipt.transactionHash.hex(),
+                    'developer_address': event.args['developerAddress'],
+                    'token_address': event.args['tokenAddress'],
+                    'github_username': event.args['githubUsername']
+                }
+            elif event.name == 'DeveloperRegistrationFailed':
+                # An out-of-gas entry is caught like any other revert but
+                # leaves no reason behind
+                reason = bytes(event.args['reason'])
+                out_of_gas = out_of_gas or not reason
+                outcomes[event.args['githubUsername']] = {
+                    'success': False,
+                    'error': self._decode_revert_reason(reason) if reason else 'Ran out of gas'
+                }
+        if out_of_gas:
+            # The transaction succeeded, so the tracker never drops this estimate itself
+            self.tx_manager.gas.forget(self.auto_registration.functions.registerDevelopers(chunk))
+
+        results = {}
+        for github_username, *_ in chunk:
+            results[github_username] = outcomes.get(
+                github_username, {'success': False, 'error': 'No registration event in receipt'}
+            )
+            if results[github_username]['success']:
+                print(f"Registered {github_username}. Token address: {results[github_username]['token_address']}")
+            else:
+                print(f"Failed to register {github_username}: {results[github_username]['error']}")
+        return results
+
+    async def _register_individually(self,
+                                     registrations: List[Tuple]) -> Dict[str, Dict[str, Any]]:
+        """Fallback: broadcast single registrations back to back, then await them together"""
+        submitted = []
+        for github_username, *params in registrations:
+            try:
+                submitted.append((github_username, *await self.submit_registration(github_username, *params)))
+            except Exception as e:
+                print(f"Error during registration: {str(e)}")
+                submitted.append((github_username, None, str(e)))
+
+        async def complete(github_username, pending, developer_address):
+            if pending is None:
+                return github_username, {'success': False, 'error': developer_address}
+            return github_username, await self.complete_registration(github_username, developer_address, pending)
+
+        return dict(await asyncio.gather(*(complete(*entry) for entry in submitted)))
+
+    async def _has_batch_registration(self) -> bool:
+        """Whether the deployed AutoRegistration has the registerDevelopers entrypoint"""
+        if self._batch_registration_available is None:
+            if os.getenv('REGISTRATION_BATCH_ENABLED', 'true').lower() != 'true':
+                self._batch_registration_available = False
+            else:
+                selector = bytes.fromhex(
+                    self.auto_registration.get_function_by_name('registerDevelopers').selector[2:]
+                )
+                code = await self.w3.eth.get_code(self.auto_registration.address)
+                self._batch_registration_available = selector in bytes(code)
+        return self._batch_registration_available
+
+    def _decode_revert_reason(self, reason: bytes) -> str:
+        """Readable name for a revert payload of one of our contracts"""
+        reason = bytes(reason)
+        if len(reason) < 4:
+            return 'Reverted without reason'
+        if reason[:4] == bytes.fromhex('08c379a0'):
+            return self.w3.codec.decode(['string'], reason[4:])[0]
+        for contract in (self.auto_registration, self.registry, self.investment):
+            for entry in contract.abi:
+                if entry.get('type') != 'error':
+                    continue
+                signature = f"{entry['name']}({','.join(arg['type'] for arg in entry['inputs'])})"
+                if self.w3.keccak(text=signature)[:4] == reason[:4]:
+                    return entry['name']
+        return '0x' + reason.hex()
+
+    async def complete_registration(self,
+                                    github_username: str,
+                                    developer_address: str,
+                                    pending: PendingTransaction) -> Dict[str, Any]:
+        """Wait for a submitted registration and resolve the developer's token"""
+        try:
+            try:
+                receipt = await self.tx_manager.wait(pending)
+            except Exception as e:
+                raise Exception(f"Transaction failed: {str(e)}")
 
             if receipt.status == 1:
+                events = self.decoder.decode_receipt(receipt)
+                if self.indexer is not None:
+                    self.indexer.ingest_events(events)
+
                 # First try to get token from investment event
-                token_address = self._get_token_from_investment_event(receipt)
+                token_address = self._get_token_from_investment_event(events)
                 
                 # If that fails, try registry
                 if not token_address:
-                    token_address = self._get_token_from_registry(developer_address)
+                    token_address = await self._get_token_from_registry(developer_address)
                 
                 if not token_address:
                     raise Exception("Could not find token address")
@@ -166,19 +457,158 @@ class EnhancedContractIntegrator:
 
     async def check_if_registered(self, github_username: str) -> bool:
         """Check if a developer is already registered"""
+        if self.index is not None and self.index.is_registered(github_username):
+            return True
+
         try:
+            await self.connect()
+
             # First check isRegistered mapping
-            is_registered = self.auto_registration.functions.isRegistered(github_username).call()
+            is_registered = await self.auto_registration.functions.isRegistered(github_username).call()
             print(f"Direct registration check for {github_username}: {is_registered}")
             
             if not is_registered:
                 # Double check by looking up in github_to_wallet mapping
-                address = self.registry.functions.githubToWallet(github_username).call()
+                address = await self.registry.functions.githubToWallet(github_username).call()
                 print(f"Registry check for {github_username}: {address}")
-                if address and address != '0x' + '0' * 40:
+                if address and address != ZERO_ADDRESS:
                     return True
             
             return is_registered
         except Exception as e:
             print(f"Error checking registration: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    async def check_many_registered(self, github_usernames: List[str]) -> Dict[str, bool]:
+        """Check registration for many usernames with a few batched round trips
+
+        Both AutoRegistration.isRegistered and TalentRegistry.githubToWallet
+        are read for every username, aggregated into Multicall3 calls or,
+        where Multicall3 isn't deployed, JSON-RPC batch requests.
+        """
+        usernames = list(dict.fromkeys(github_usernames))
+        registered = {}
+        if self.index is not None:
+            registered = {username: True for username in usernames if self.index.is_registered(username)}
+            usernames = [username for username in usernames if username not in registered]
+        if not usernames:
+            return registered
+        await self.connect()
+
+        calls = []
+        for username in usernames:
+            calls.append((self.auto_registration.address,
+                          self.auto_registration.encodeABI(fn_name='isRegistered', args=[username])))
+            calls.append((self.registry.address,
+                          self.registry.encodeABI(fn_name='githubToWallet', args=[username])))
+
+        try:
+            if await self._has_multicall():
+                results = await self._multicall(calls)
+            else:
+                results = await self._rpc_batch_call(calls)
+        except Exception as e:
+            # Don't lose the whole batch; every username is checked on its own
+            print(f"Batched registration check failed, checking individually: {str(e)}")
+            results = [None] * len(calls)
+
+        unresolved = []
+        for i, username in enumerate(usernames):
+            is_registered_data, wallet_data = results[2 * i], results[2 * i + 1]
+            if is_registered_data is None or wallet_data is None:
+                unresolved.append(username)
+                continue
+            try:
+                is_registered = self.w3.codec.decode(['bool'], is_registered_data)[0]
+                wallet = self.w3.codec.decode(['address'], wallet_data)[0]
+            except Exception:
+                # e.g. empty return data from a call that "succeeded"
+                unresolved.append(username)
+                continue
+            registered[username] = is_registered or wallet.lower() != ZERO_ADDRESS
+
+        # Fall back to the individual check for calls that failed
+        checks = await asyncio.gather(*(self.check_if_registered(username) for username in unresolved))
+        registered.update(zip(unresolved, checks))
+        return registered
+
+    async def get_token_for_username(self, github_username: str) -> Optional[str]:
+        """Token address of a developer by GitHub username"""
+        if self.index is not None:
+            token_address = self.index.token_for_username(github_username)
+            if token_address:
+                return token_address
+        try:
+            await self.connect()
+            token_address = await self.investment.functions.getTokenByUsername(github_username).call()
+            return token_address if token_address != ZERO_ADDRESS else None
+        except Exception as e:
+            print(f"Error getting token for {github_username}: {str(e)}")
+            return None
+
+    async def get_token_for_developer(self, developer_address: str) -> Optional[str]:
+        """Token address of a developer by wallet address"""
+        if self.index is not None:
+            token_address = self.index.token_for_developer(developer_address)
+            if token_address:
+                return token_address
+        try:
+            await self.connect()
+            return await self._get_token_from_registry(developer_address)
+        except Exception as e:
+            print(f"Error getting token for {developer_address}: {str(e)}")
+            return None
+
+    async def _has_multicall(self) -> bool:
+        if self._multicall_available is None:
+            code = await self.w3.eth.get_code(self.multicall.address)
+            self._multicall_available = len(code) > 0
+        return self._multicall_available
+
+    async def _multicall(self, calls: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+        """Run view calls through Multicall3.aggregate3, one eth_call per chunk"""
+        chunks = [calls[i:i + self.multicall_batch_size] for i in range(0, len(calls), self.multicall_batch_size)]
+        responses = await asyncio.gather(*(
+            self.multicall.functions.aggregate3([(target, True, data) for target, data in chunk]).call()
+            for chunk in chunks
+        ))
+        return [
+            bytes(return_data) if success else None
+            for response in responses
+            for success, return_data in response
+        ]
+
+    async def _rpc_batch_call(self, calls: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+        """Run view calls as JSON-RPC batch requests over the pooled session"""
+        results: List[Optional[bytes]] = [None] * len(calls)
+
+        async def send_chunk(offset: int):
+            chunk = calls[offset:offset + self.rpc_batch_size]
+            payload = [
+                {'jsonrpc': '2.0', 'id': offset + i, 'method': 'eth_call',
+                 'params': [{'to': target, 'data': data}, 'latest']}
+                for i, (target, data) in enumerate(chunk)
+            ]
+            started = time.perf_counter()
+            status = "error"
+            try:
+                async with self._session.post(self.rpc_url, json=payload) as response:
+                    response.raise_for_status()
+                    body = await response.json(content_type=None)
+                status = "ok" if isinstance(body, list) else "error"
+            finally:
+                elapsed = time.perf_counter() - started
+                metrics.RPC_CALLS.labels(method="eth_call_batch", status=status).inc()
+                metrics.RPC_CALL_SECONDS.labels(method="eth_call_batch").observe(elapsed)
+                metrics.TRACE.record("rpc", "eth_call_batch", elapsed, status=status, calls=len(chunk))
+            if not isinstance(body, list):
+                raise Exception(f"RPC node rejected batch request: {body}")
+            for item in body:
+                if 'result' in item:
+                    results[item['id']] = bytes.fromhex(item['result'][2:])
+
+        await asyncio.gather(*(send_chunk(offset) for offset in range(0, len(calls), self.rpc_batch_size)))
+        return results
+
+# For backward compatibility
+ContractIntegrator = EnhancedContractIntegrator
\ No newline at end of file
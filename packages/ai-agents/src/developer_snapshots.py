@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai_analyzer import EnhancedDeveloperAnalyzer
+from github_graphql import create_github_client
+from sqlite_store import SQLiteStore, data_path
+
+class DeveloperSnapshotStore(SQLiteStore):
+    """Last known profile, refresh state and analysis of each tracked developer
+
+    state is what GitHubClient.refresh_developer_data needs to fetch only
+    what changed. basis records the profile inputs the stored analysis was
+    made from, so a refresh can tell whether it is still current.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            username TEXT PRIMARY KEY,
+            dev_data TEXT NOT NULL,
+            state TEXT NOT NULL,
+            refreshed_at REAL NOT NULL,
+            analysis TEXT,
+            basis TEXT,
+            analyzed_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS snapshots_refreshed_at ON snapshots (refreshed_at);
+    """
+
+    def __init__(self, path: str = None):
+        super().__init__(path or os.getenv("DEVELOPER_SNAPSHOT_PATH") or data_path("developer_snapshots.sqlite"))
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        row = self.fetchone("SELECT * FROM snapshots WHERE username = ?", (username.lower(),))
+        if row is None:
+            return None
+        return {
+            "username": row["username"],
+            "dev_data": json.loads(row["dev_data"]),
+            "state": json.loads(row["state"]),
+            "refreshed_at": row["refreshed_at"],
+            "analysis": json.loads(row["analysis"]) if row["analysis"] else None,
+            "basis": json.loads(row["basis"]) if row["basis"] else None,
+            "analyzed_at": row["analyzed_at"]
+        }
+
+    def save_data(self, username: str, dev_data: Dict[str, Any], state: Dict[str, Any]):
+        """Store a refreshed profile, keeping any analysis already recorded"""
+        self.execute(
+            """INSERT INTO snapshots (username, dev_data, state, refreshed_at) VALUES (?, ?, ?, ?)
+               ON CONFLICT(username) DO UPDATE SET
+                   dev_data = excluded.dev_data, state = excluded.state, refreshed_at = excluded.refreshed_at""",
+            (username.lower(), json.dumps(dev_data), json.dumps(state), time.time())
+        )
+
+    def save_analysis(self, username: str, analysis: Dict[str, Any], basis: Dict[str, Any]):
+        self.execute(
+            "UPDATE snapshots SET analysis = ?, basis = ?, analyzed_at = ? WHERE username = ?",
+            (json.dumps(analysis, default=str), json.dumps(basis), time.time(), username.lower())
+        )
+
+    def stale(self, older_than: float, limit: int = None) -> List[str]:
+        """Tracked usernames not refreshed within older_than seconds, oldest first"""
+        rows = self.fetchall(
+            "SELECT username FROM snapshots WHERE refreshed_at < ? ORDER BY refreshed_at LIMIT ?",
+            (time.time() - older_than, limit if limit is not None else -1)
+        )
+        return [row["username"] for row in rows]
+
+    def count(self) -> int:
+        return self.fetchone("SELECT COUNT(*) FROM snapshots")[0]
+
+class DeveloperRefresher:
+    """Keeps tracked developers current without re-crawling or re-scoring them
+
+    Profiles are refreshed incrementally from their snapshot, and the LLM
+    analysis is only run again when the inputs it was based on changed
+    materially: a different bio or name, a new top repository or skill, a
+    reputation score that moved by REFRESH_REPUTATION_DELTA points, or an
+    analysis older than REFRESH_MAX_ANALYSIS_AGE seconds.
+    """
+
+    def __init__(self, github=None, analyzer=None, store: DeveloperSnapshotStore = None):
+        if github is not None:
+            self.github = github
+        if analyzer is not None:
+            self.analyzer = analyzer
+        self.store = store or DeveloperSnapshotStore()
+
+        self.reputation_delta = int(os.getenv("REFRESH_REPUTATION_DELTA", "10"))
+        self.max_analysis_age = float(os.getenv("REFRESH_MAX_ANALYSIS_AGE", str(30 * 24 * 3600)))
+        self.refresh_concurrency = int(os.getenv("REFRESH_CONCURRENCY", "8"))
+        self.analyses_run = 0
+
+    @cached_property
+    def github(self):
+        return create_github_client()
+
+    @cached_property
+    def analyzer(self) -> EnhancedDeveloperAnalyzer:
+        return EnhancedDeveloperAnalyzer()
+
+    async def refresh_data(self, username: str) -> Optional[Dict[str, Any]]:
+        """Up-to-date profile for a developer, fetched incrementally when tracked"""
+        snapshot = self.store.get(username)
+        state = snapshot["state"] if snapshot else {}
+        dev_data, state = await self.github.refresh_developer_data(username, state)
+        if dev_data is None:
+            # Serve the last known profile rather than nothing
+            return snapshot["dev_data"] if snapshot else None
+        self.store.save_data(username, dev_data, state)
+        return dev_data
+
+    async def analyze(self, username: str, dev_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stored analysis if still current, otherwise a fresh one"""
+        snapshot = self.store.get(username)
+        basis = self._analysis_basis(dev_data)
+        if snapshot and snapshot["analysis"]:
+            changes = self.material_changes(snapshot["basis"], basis, snapshot["analyzed_at"])
+            if not changes:
+                return snapshot["analysis"]
+            print(f"Re-analyzing {username}: {', '.join(changes)}")
+
+        analysis = await self.analyzer.analyze_developer(dev_data)
+        self.analyses_run += 1
+        if analysis:
+            self.store.save_analysis(username, analysis, basis)
+        return analysis
+
+    async def refresh(self, username: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Refresh a developer's profile and, if it changed materially, its analysis"""
+        dev_data = await self.refresh_data(username)
+        if not dev_data:
+            return None, None
+        return dev_data, await self.analyze(username, dev_data)
+
+    async def refresh_tracked(self, older_than: float = 0, limit: int = None) -> Dict[str, int]:
+        """Refresh every tracked developer not refreshed within older_than seconds"""
+        usernames = self.store.stale(older_than, limit)
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+        analyses_before = self.analyses_run
+
+        async def refresh_one(username: str):
+            async with semaphore:
+                await self.refresh(username)
+
+        await asyncio.gather(*(refresh_one(username) for username in usernames))
+        return {"refreshed": len(usernames), "reanalyzed": self.analyses_run - analyses_before}
+
+    def _analysis_basis(self, dev_data: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a profile that shape the analysis prompt"""
+        basic_info = dev_data.get("basic_info", {})
+        return {
+            "name": basic_info.get("name"),
+            "bio": basic_info.get("bio"),
+            "top_repositories": [repo.get("name") for repo in dev_data.get("repositories", [])],
+            "skills": self.analyzer._create_skill_tags(dev_data.get("repositories", [])),
+            "reputation": self.analyzer._calculate_initial_reputation(dev_data)
+        }
+
+    def material_changes(self, old: Optional[Dict[str, Any]], new: Dict[str, Any],
+                         analyzed_at: Optional[float]) -> List[str]:
+        """Reasons the stored analysis is out of date; empty if it still holds"""
+        if not old or analyzed_at is None:
+            return ["no previous analysis"]
+
+        changes = []
+        if time.time() - analyzed_at > self.max_analysis_age:
+            changes.append("analysis expired")
+        if old.get("name") != new["name"] or old.get("bio") != new["bio"]:
+            changes.append("profile changed")
+        if old.get("top_repositories") != new["top_repositories"]:
+            changes.append("top repositories changed")
+        added_skills = set(new["skills"]) - set(old.get("skills", []))
+        if added_skills:
+            changes.append(f"new skills {', '.join(sorted(added_skills))}")
+        if abs(new["reputation"] - old.get("reputation", 0)) >= self.reputation_delta:
+            changes.append(f"reputation {old.get('reputation', 0)} -> {new['reputation']}")
+        return changes
+
+    async def aclose(self):
+        if 'github' in self.__dict__:
+            await self.github.aclose()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Refresh tracked developers from their snapshots")
+    parser.add_argument("usernames", nargs="*", help="developers to refresh (default: all tracked)")
+    parser.add_argument("--older-than", type=float, default=0, help="skip developers refreshed within this many seconds")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    refresher = DeveloperRefresher()
+    try:
+        if args.usernames:
+            for username in args.usernames:
+                dev_data, analysis = await refresher.refresh(username)
+                score = analysis.get("confidence_score") if analysis else None
+                print(f"{username}: {'refreshed' if dev_data else 'unavailable'}, confidence score {score}")
+        else:
+            print(f"Tracking {refresher.store.count()} developers")
+            print(await refresher.refresh_tracked(args.older_than, args.limit))
+    finally:
+        await refresher.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
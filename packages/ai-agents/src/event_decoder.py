@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from eth_utils import event_abi_to_log_topic
+from web3._utils.events import get_event_data
+
+@dataclass(frozen=True)
+class DecodedEvent:
+    """A decoded contract log"""
+    name: str
+    contract: str
+    address: str
+    args: Dict[str, Any]
+    block_number: Optional[int]
+    block_hash: Optional[str]
+    tx_hash: Optional[str]
+    log_index: Optional[int]
+
+def _hex(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.lower()
+    return '0x' + bytes(value).hex()
+
+class EventDecoder:
+    """Decodes logs of the known contracts by topic lookup
+
+    topic0 -> event ABI maps are built once from the contract ABIs, so each
+    log is decoded at most once with the one ABI entry that can match it.
+    """
+
+    def __init__(self, codec, abis: Dict[str, list], addresses: Dict[str, str] = None):
+        self.codec = codec
+        # Deployed address -> contract name, used to attribute shared signatures
+        self.addresses = {
+            address.lower(): name for name, address in (addresses or {}).items() if address
+        }
+
+        # topic0 -> [(contract name, event ABI)], several when contracts share an event
+        self._events: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for contract_name, abi in abis.items():
+            for entry in abi:
+                if entry.get('type') != 'event' or entry.get('anonymous'):
+                    continue
+                topic = '0x' + event_abi_to_log_topic(entry).hex()
+                self._events.setdefault(topic, []).append((contract_name, entry))
+
+    def topic(self, event_name: str) -> Optional[str]:
+        """topic0 of an event by name"""
+        for topic, candidates in self._events.items():
+            if any(entry['name'] == event_name for _, entry in candidates):
+                return topic
+        return None
+
+    def decode_log(self, log) -> Optional[DecodedEvent]:
+        """Decode a single log, or None if it isn't one of ours"""
+        topics = log['topics']
+        if not topics:
+            return None
+        candidates = self._events.get(_hex(topics[0]))
+        if not candidates:
+            return None
+
+        address = log['address']
+        known_contract = self.addresses.get(address.lower())
+        for contract_name, event_abi in candidates:
+            if known_contract and len(candidates) > 1 and contract_name != known_contract:
+                continue
+            try:
+                event = get_event_data(self.codec, event_abi, log)
+            except Exception:
+                # Same signature with a different indexed layout; try the next ABI
+                continue
+            return DecodedEvent(
+                name=event['event'],
+                contract=known_contract or contract_name,
+                address=address,
+                args=dict(event['args']),
+                block_number=log.get('blockNumber'),
+                block_hash=_hex(log.get('blockHash')),
+                tx_hash=_hex(log.get('transactionHash')),
+                log_index=log.get('logIndex')
+            )
+        return None
+
+    def decode_logs(self, logs: Iterable) -> List[DecodedEvent]:
+        events = []
+        for log in logs:
+            event = self.decode_log(log)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def decode_receipt(self, receipt) -> List[DecodedEvent]:
+        return self.decode_logs(receipt['logs'])
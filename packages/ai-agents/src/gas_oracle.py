@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from web3 import AsyncWeb3
+
+def _arg_shape(value) -> Any:
+    """Shape of a call argument as far as gas usage is concerned"""
+    if isinstance(value, (str, bytes)):
+        # Storage is paid per 32-byte word
+        return (type(value).__name__, (len(value) + 31) // 32)
+    if isinstance(value, (list, tuple)):
+        return (len(value), tuple(_arg_shape(item) for item in value))
+    return type(value).__name__
+
+class GasEstimator:
+    """Per-call gas limits from estimate_gas plus a safety margin
+
+    Estimates are cached per contract, function selector and argument
+    shape, so bulk calls of the same kind cost one eth_estimateGas.
+    """
+
+    def __init__(self, w3: AsyncWeb3):
+        self.w3 = w3
+        self.multiplier = float(os.getenv("GAS_LIMIT_MULTIPLIER", "1.2"))
+        self.cache_ttl = float(os.getenv("GAS_ESTIMATE_CACHE_TTL", "600"))
+        self._cache: Dict[Tuple, Tuple[int, float]] = {}
+
+    def _cache_key(self, contract_function, value: int) -> Tuple:
+        return (
+            contract_function.address,
+            contract_function.selector,
+            tuple(_arg_shape(arg) for arg in contract_function.arguments),
+            bool(value)
+        )
+
+    async def gas_limit(self, contract_function, sender: str, value: int = 0, multiplier: float = None) -> int:
+        """Cached or fresh estimate times the multiplier (GAS_LIMIT_MULTIPLIER by default)"""
+        key = self._cache_key(contract_function, value)
+        cached = self._cache.get(key)
+        if cached is not None and time.time() - cached[1] < self.cache_ttl:
+            return cached[0]
+
+        try:
+            estimate = await contract_function.estimate_gas({'from': sender, 'value': value})
+        except Exception as e:
+            raise Exception(f"Gas estimation failed for {contract_function.fn_name}: {str(e)}")
+
+        gas_limit = int(estimate * (multiplier or self.multiplier))
+        self._cache[key] = (gas_limit, time.time())
+        return gas_limit
+
+    def forget(self, contract_function, value: int = 0):
+        """Drop a cached estimate, e.g. after a transaction ran out of gas"""
+        self._cache.pop(self._cache_key(contract_function, value), None)
+
+class FeeOracle:
+    """EIP-1559 fees from eth_feeHistory percentiles, with a legacy fallback
+
+    The priority fee is the median of the chosen reward percentile over the
+    last blocks and the fee cap leaves room for the base fee to keep rising
+    for a few blocks. Nodes without fee history get a legacy gasPrice.
+    """
+
+    def __init__(self, w3: AsyncWeb3):
+        self.w3 = w3
+        self.enabled = os.getenv("EIP1559_ENABLED", "true").lower() == "true"
+        self.history_blocks = int(os.getenv("FEE_HISTORY_BLOCKS", "10"))
+        self.reward_percentile = float(os.getenv("FEE_PRIORITY_PERCENTILE", "50"))
+        self.base_fee_multiplier = float(os.getenv("FEE_BASE_MULTIPLIER", "2"))
+        self.cache_seconds = float(os.getenv("FEE_CACHE_SECONDS", "3"))
+
+        self._supported: Optional[bool] = None
+        self._fees: Optional[Dict[str, int]] = None
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def fees(self) -> Dict[str, int]:
+        """Fee fields for a transaction: maxFeePerGas/maxPriorityFeePerGas or gasPrice"""
+        async with self._lock:
+            if self._fees is None or time.time() - self._fetched_at >= self.cache_seconds:
+                self._fees = await self._fetch()
+                self._fetched_at = time.time()
+            return dict(self._fees)
+
+    async def _fetch(self) -> Dict[str, int]:
+        if self.enabled and self._supported is not False:
+            try:
+                history = await self.w3.eth.fee_history(self.history_blocks, 'latest', [self.reward_percentile])
+                base_fees = history.get('baseFeePerGas') or []
+                if base_fees and base_fees[-1]:
+                    self._supported = True
+                    rewards = sorted(reward[0] for reward in history.get('reward') or [] if reward)
+                    priority_fee = rewards[len(rewards) // 2] if rewards else 0
+                    # The last entry is the base fee of the next block
+                    max_fee = int(base_fees[-1] * self.base_fee_multiplier) + priority_fee
+                    return {'maxFeePerGas': max_fee, 'maxPriorityFeePerGas': priority_fee}
+                self._supported = False
+            except Exception as e:
+                print(f"eth_feeHistory unavailable ({str(e)}), using legacy gas price")
+                self._supported = False
+
+        return {'gasPrice': await self.w3.eth.gas_price}
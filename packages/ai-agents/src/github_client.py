@@ -2,18 +2,45 @@ import httpx
 import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, AsyncIterator, Optional, Tuple
 import asyncio
 import random
+import time
+from http_cache import GitHubResponseCache
+from rate_limiter import RateLimitGovernor
+from verdict_store import QualityVerdictStore
+from single_flight import SingleFlight
+import metrics
 
 class GitHubClient:
-    def __init__(self):
+    SEARCH_QUERIES = [
+        # Core Solidity developers
+        "language:solidity type:user followers:>50",
+        "ethereum solidity type:user stars:>50",
+        
+        # Active web3 contributors
+        "web3 solidity type:user",
+        "smart contracts language:solidity type:user",
+        
+        # Recent activity focus
+        "blockchain created:>2023-01-01 language:solidity type:user",
+        "defi language:solidity type:user",
+        
+        # Specific frameworks/tools
+        "hardhat foundry type:user language:solidity",
+        "openzeppelin type:user language:solidity"
+    ]
+
+    def __init__(self, max_concurrency: int = None, max_connections: int = None,
+                 max_keepalive_connections: int = None, http2: bool = None,
+                 cache: GitHubResponseCache = None, governor: RateLimitGovernor = None,
+                 verdicts: QualityVerdictStore = None):
         load_dotenv()
         self.api_key = os.getenv("GITHUB_API_KEY")
         if not self.api_key:
             raise Exception("GITHUB_API_KEY not found in environment variables")
             
-        self.base_url = "https://api.github.com"
+        self.base_url = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Accept": "application/vnd.github+json",
@@ -21,21 +48,109 @@ class GitHubClient:
         }
         self.client_timeout = httpx.Timeout(30.0)
 
-    async def _make_github_request(self, client: httpx.AsyncClient, url: str, params: Dict = None) -> Dict:
+        # Bounds how many GitHub requests are in flight at once across all
+        # concurrent fetches made by this client
+        self.max_concurrency = max_concurrency or int(os.getenv("GITHUB_MAX_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.governor = governor or RateLimitGovernor()
+        self.max_retries = int(os.getenv("GITHUB_MAX_RETRIES", "5"))
+
+        # Discovery: search pagination (GitHub serves at most 1000 results per
+        # query) and how many candidate quality checks run at once
+        self.search_page_size = int(os.getenv("GITHUB_SEARCH_PAGE_SIZE", "30"))
+        self.search_max_pages = int(os.getenv("GITHUB_SEARCH_MAX_PAGES", "10"))
+        self.quality_check_concurrency = int(os.getenv("GITHUB_QUALITY_CHECK_CONCURRENCY", str(self.max_concurrency)))
+
+        # One pooled client is shared by every request so connections to
+        # api.github.com are reused across profiles instead of re-handshaking
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(os.getenv("GITHUB_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=max_keepalive_connections or int(os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("GITHUB_KEEPALIVE_EXPIRY", "30"))
+        )
+        self.http2 = http2 if http2 is not None else os.getenv("GITHUB_HTTP2", "true").lower() != "false"
+        self._client: httpx.AsyncClient = None
+
+        # Conditional-request cache; 304 responses don't use rate limit budget
+        if cache is None and os.getenv("GITHUB_CACHE_ENABLED", "true").lower() != "false":
+            cache = GitHubResponseCache()
+        self.cache = cache
+
+        # Remembered quality check verdicts so repeat candidates cost nothing
+        if verdicts is None and os.getenv("GITHUB_VERDICT_CACHE_ENABLED", "true").lower() != "false":
+            verdicts = QualityVerdictStore()
+        self.verdicts = verdicts
+
+        # The events API serves at most 300 events, 100 per page
+        self.event_max_pages = int(os.getenv("GITHUB_EVENT_MAX_PAGES", "3"))
+
+        # Concurrent lookups of the same user share one fetch
+        self._flights = SingleFlight()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.client_timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client and its connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "GitHubClient":
+        self.client  # Open the connection pool up front
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _make_github_request(self, url: str, params: Dict = None) -> Dict:
         """Helper method for making GitHub API requests with rate limit handling"""
         try:
-            response = await client.get(url, params=params, headers=self.headers)
-            if response.status_code == 403 and 'X-RateLimit-Remaining' in response.headers:
-                remaining = int(response.headers['X-RateLimit-Remaining'])
-                if remaining == 0:
-                    reset_time = int(response.headers['X-RateLimit-Reset'])
-                    wait_time = reset_time - int(datetime.now().timestamp()) + 1
-                    print(f"Rate limit exceeded. Waiting {wait_time} seconds...")
-                    await asyncio.sleep(min(wait_time, 60))
-                    return await self._make_github_request(client, url, params)
-            
-            response.raise_for_status()
-            return response.json()
+            cache_key = entry = None
+            if self.cache:
+                cache_key = self.cache.make_key(url, params)
+                entry = self.cache.get(cache_key)
+
+            resource = self.governor.resource_for(url)
+            for attempt in range(self.max_retries + 1):
+                await self.governor.acquire(resource)
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        response = await self.client.get(
+                            url,
+                            params=params,
+                            headers=self.cache.conditional_headers(entry) if self.cache else None
+                        )
+                    except httpx.TransportError:
+                        self._record_request(url, "error", time.perf_counter() - started)
+                        raise
+                    self._record_request(url, response.status_code, time.perf_counter() - started)
+
+                if response.status_code == 304 and entry:
+                    self.governor.observe(resource, response)
+                    return self.cache.revalidated(cache_key, entry)
+
+                # The governor blocks the resource until the limit clears,
+                # so the retry waits in acquire()
+                retry_delay = self.governor.observe(resource, response)
+                if retry_delay and attempt < self.max_retries:
+                    print(f"Rate limited on {url}. Retrying in {int(retry_delay)} seconds...")
+                    continue
+
+                response.raise_for_status()
+                if self.cache:
+                    self.cache.store(cache_key, response)
+                return response.json()
         except httpx.HTTPStatusError as e:
             print(f"HTTP error {e.response.status_code} for {url}: {str(e)}")
             return None
@@ -43,237 +158,472 @@ class GitHubClient:
             print(f"Error making request to {url}: {str(e)}")
             return None
 
+    def _endpoint(self, url: str) -> str:
+        """Route of a GitHub URL with user and repo names replaced, for metric labels"""
+        parts = url[len(self.base_url):].strip("/").split("/")
+        if parts[0] == "users" and len(parts) > 1:
+            parts[1] = ":user"
+        elif parts[0] == "repos" and len(parts) > 2:
+            parts[1:3] = [":owner", ":repo"]
+        return "/".join(parts)
+
+    def _record_request(self, url: str, status, seconds: float):
+        endpoint = self._endpoint(url)
+        metrics.GITHUB_REQUESTS.labels(endpoint=endpoint, status=status).inc()
+        metrics.GITHUB_REQUEST_SECONDS.labels(endpoint=endpoint).observe(seconds)
+        metrics.TRACE.record("github", endpoint, seconds, status=status)
+
     async def discover_web3_developers(self, limit: int = 10) -> List[str]:
         """Discover individual web3 developers with expanded search criteria"""
-        developers: Set[str] = set()
-        
-        # More diverse search queries
-        queries = [
-            # Core Solidity developers
-            "language:solidity type:user followers:>50",
-            "ethereum solidity type:user stars:>50",
-            
-            # Active web3 contributors
-            "web3 solidity type:user",
-            "smart contracts language:solidity type:user",
-            
-            # Recent activity focus
-            "blockchain created:>2023-01-01 language:solidity type:user",
-            "defi language:solidity type:user",
-            
-            # Specific frameworks/tools
-            "hardhat foundry type:user language:solidity",
-            "openzeppelin type:user language:solidity"
-        ]
+        return [username async for username in self.iter_web3_developers(limit)]
+
+    async def iter_web3_developers(self, limit: int = 10) -> AsyncIterator[str]:
+        """Yield qualified web3 developers as soon as they pass the quality check
+
+        Search results are paginated lazily and quality checks for several
+        candidates run concurrently, so the first developers are available
+        long before the whole sweep has finished.
+        """
+        seen: Set[str] = set()
+        pending: Set[asyncio.Task] = set()
+        found = 0
+        candidates = self._iter_search_candidates()
+        exhausted = False
+
+        try:
+            while True:
+                if not exhausted and len(pending) < self.quality_check_concurrency:
+                    # Room for another check: pull the next search hit and
+                    # hand out whatever has already finished meanwhile
+                    try:
+                        username = await candidates.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        continue
+                    if username not in seen:
+                        seen.add(username)
+                        pending.add(asyncio.create_task(self._check_candidate(username)))
+                    done = {task for task in pending if task.done()}
+                elif pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    return
+
+                pending -= done
+                for task in done:
+                    username, is_quality = task.result()
+                    if is_quality:
+                        print(f"Found promising developer: {username}")
+                        yield username
+                        found += 1
+                        if found >= limit:
+                            return
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled checks finish before the caller can close the client
+            await asyncio.gather(*pending, return_exceptions=True)
+            await candidates.aclose()
+
+    async def _check_candidate(self, username: str):
+        return username, await self._is_quality_developer(username)
+
+    async def _iter_search_candidates(self) -> AsyncIterator[str]:
+        """Page through the user search results of every query, one page at a time"""
+        queries = list(self.SEARCH_QUERIES)
         
         # Randomize queries for variety
         random.shuffle(queries)
 
-        async with httpx.AsyncClient(timeout=self.client_timeout) as client:
-            for query in queries:
-                if len(developers) >= limit:
-                    break
-                
-                # Use different sort orders for variety
-                sort_options = ["followers", "repositories", "joined"]
+        for query in queries:
+            # Use different sort orders for variety
+            sort_options = ["followers", "repositories", "joined"]
+            sort = random.choice(sort_options)
+            order = random.choice(["desc", "asc"])
+
+            for page in range(1, self.search_max_pages + 1):
                 response_data = await self._make_github_request(
-                    client,
                     f"{self.base_url}/search/users",
                     params={
                         "q": query,
-                        "sort": random.choice(sort_options),
-                        "order": random.choice(["desc", "asc"]),
-                        "per_page": 30
+                        "sort": sort,
+                        "order": order,
+                        "per_page": self.search_page_size,
+                        "page": page
                     }
                 )
-                
-                if response_data and "items" in response_data:
-                    for user in response_data["items"]:
-                        if len(developers) >= limit:
-                            break
-                            
-                        username = user["login"]
-                        if await self._is_quality_developer(client, username):
-                            developers.add(username)
-                            print(f"Found promising developer: {username}")
-                    
-                await asyncio.sleep(2)  # Rate limiting
-                            
-        return list(developers)[:limit]
-
-    async def _is_quality_developer(self, client: httpx.AsyncClient, username: str) -> bool:
+                if not response_data or "items" not in response_data:
+                    break
+
+                for user in response_data["items"]:
+                    yield user["login"]
+
+                if len(response_data["items"]) < self.search_page_size or \
+                        page * self.search_page_size >= response_data.get("total_count", 0):
+                    break
+
+    async def _is_quality_developer(self, username: str) -> bool:
         """Enhanced check for quality web3 developers"""
+        return await self._flights.do(("quality", username.lower()), self._check_quality, username)
+
+    async def _check_quality(self, username: str) -> bool:
+        # Known verdicts are answered without any API call
+        if self.verdicts:
+            verdict = self.verdicts.get(username)
+            if verdict is not None:
+                return verdict["passed"]
+
         try:
-            # Get user info
-            user_data = await self._make_github_request(client, f"{self.base_url}/users/{username}")
-            if not user_data:
-                return False
-                
-            # Filter out organizations
-            if user_data.get("type") != "User":
-                return False
-            
-            # Check for company indicators
-            name = (user_data.get("name") or "").lower()
-            bio = (user_data.get("bio") or "").lower()
-            company = (user_data.get("company") or "").lower()
-            
-            company_indicators = ["inc", "ltd", "corp", "organization", "foundation"]
-            if any(indicator in name or indicator in company for indicator in company_indicators):
-                return False
-            
-            # Get repositories
-            repos_data = await self._make_github_request(
-                client,
-                f"{self.base_url}/users/{username}/repos",
-                params={"sort": "updated", "per_page": 30}
-            )
-            
-            if not repos_data:
-                return False
+            result = await self._evaluate_quality(username)
+        except Exception as e:
+            print(f"Error checking developer quality for {username}: {str(e)}")
+            return False
+
+        # None means the data could not be fetched; don't remember that
+        if result is None:
+            return False
+        passed, inputs = result
+        if self.verdicts:
+            self.verdicts.record(username, passed, inputs)
+        return passed
+
+    async def _evaluate_quality(self, username: str) -> Optional[Tuple[bool, Dict[str, Any]]]:
+        """Run the quality heuristics; returns the verdict and the inputs that decided it"""
+        # Get user info
+        user_data = await self._make_github_request(f"{self.base_url}/users/{username}")
+        if not user_data:
+            return None
             
-            score = 0
-            recent_activity = False
-            solidity_repos = 0
-            total_stars = 0
+        # Filter out organizations
+        if user_data.get("type") != "User":
+            return False, {"reason": "not_user", "type": user_data.get("type")}
+        
+        # Check for company indicators
+        name = (user_data.get("name") or "").lower()
+        bio = (user_data.get("bio") or "").lower()
+        company = (user_data.get("company") or "").lower()
+        
+        company_indicators = ["inc", "ltd", "corp", "organization", "foundation"]
+        if any(indicator in name or indicator in company for indicator in company_indicators):
+            return False, {"reason": "company", "name": name, "company": company}
+        
+        # Get repositories
+        repos_data = await self._make_github_request(
+            f"{self.base_url}/users/{username}/repos",
+            params={"sort": "updated", "per_page": 30}
+        )
+        
+        if repos_data is None:
+            return None
+        if not repos_data:
+            return False, {"reason": "no_repos"}
+        
+        score = 0
+        recent_activity = False
+        solidity_repos = 0
+        total_stars = 0
+        
+        for repo in repos_data:
+            # Check if repo was updated recently
+            update_time = datetime.strptime(repo["updated_at"], "%Y-%m-%dT%H:%M:%SZ")
+            if update_time > datetime.now() - timedelta(days=180):
+                recent_activity = True
             
-            for repo in repos_data:
-                # Check if repo was updated recently
-                update_time = datetime.strptime(repo["updated_at"], "%Y-%m-%dT%H:%M:%SZ")
-                if update_time > datetime.now() - timedelta(days=180):
-                    recent_activity = True
-                
-                # Language check
-                lang = (repo.get("language") or "").lower()
-                if lang == "solidity":
-                    solidity_repos += 1
-                    score += 2
-                
-                # Star count
-                stars = repo.get("stargazers_count", 0)
-                total_stars += stars
-                if stars > 100:
-                    score += 2
-                elif stars > 50:
-                    score += 1
-                
-                # Web3 indicators in description or topics
-                desc = (repo.get("description") or "").lower()
-                topics = [t.lower() for t in repo.get("topics", [])]
-                
-                web3_keywords = ["ethereum", "web3", "blockchain", "defi", "smart contract"]
-                if any(kw in desc or kw in topics for kw in web3_keywords):
-                    score += 1
+            # Language check
+            lang = (repo.get("language") or "").lower()
+            if lang == "solidity":
+                solidity_repos += 1
+                score += 2
             
-            # Quality criteria
-            has_enough_stars = total_stars > 50
-            is_active = recent_activity
-            has_solidity = solidity_repos > 0
+            # Star count
+            stars = repo.get("stargazers_count", 0)
+            total_stars += stars
+            if stars > 100:
+                score += 2
+            elif stars > 50:
+                score += 1
             
-            return (has_solidity or score >= 3) and is_active and has_enough_stars
+            # Web3 indicators in description or topics
+            desc = (repo.get("description") or "").lower()
+            topics = [t.lower() for t in repo.get("topics", [])]
             
-        except Exception as e:
-            print(f"Error checking developer quality for {username}: {str(e)}")
-            return False
+            web3_keywords = ["ethereum", "web3", "blockchain", "defi", "smart contract"]
+            if any(kw in desc or kw in topics for kw in web3_keywords):
+                score += 1
+        
+        # Quality criteria
+        has_enough_stars = total_stars > 50
+        is_active = recent_activity
+        has_solidity = solidity_repos > 0
+        
+        passed = (has_solidity or score >= 3) and is_active and has_enough_stars
+        return passed, {
+            "followers": user_data.get("followers", 0),
+            "score": score,
+            "solidity_repos": solidity_repos,
+            "total_stars": total_stars,
+            "recent_activity": recent_activity
+        }
 
     async def get_developer_data(self, username: str) -> Dict[str, Any]:
         """Get comprehensive developer data with better error handling"""
+        return await self._flights.do(("developer", username.lower()), self._fetch_developer_data, username)
+
+    async def get_developers_data(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get developer data for many users; the REST API has no batch call, so one user at a time"""
+        results = await asyncio.gather(*(self.get_developer_data(username) for username in usernames))
+        return dict(zip(usernames, results))
+
+    async def _fetch_developer_data(self, username: str) -> Dict[str, Any]:
         try:
-            async with httpx.AsyncClient(timeout=self.client_timeout) as client:
-                user_data = await self._make_github_request(client, f"{self.base_url}/users/{username}")
-                if not user_data:
-                    return None
-                    
-                repos_data = await self._make_github_request(
-                    client,
+            user_data, repos_data = await asyncio.gather(
+                self._make_github_request(f"{self.base_url}/users/{username}"),
+                self._make_github_request(
                     f"{self.base_url}/users/{username}/repos",
                     params={"sort": "stars", "direction": "desc", "per_page": 100}
-                ) or []
-
-                # Process top repositories
-                top_repos = []
-                for repo in sorted(repos_data, key=lambda x: x.get("stargazers_count", 0), reverse=True)[:5]:
-                    languages = await self._get_repo_languages(client, username, repo["name"])
-                    
-                    top_repos.append({
-                        "name": repo.get("name", ""),
-                        "description": repo.get("description", ""),
-                        "stars": repo.get("stargazers_count", 0),
-                        "forks": repo.get("forks_count", 0),
-                        "languages": languages,
-                        "last_updated": repo.get("updated_at", ""),
-                        "url": repo.get("html_url", "")
-                    })
-
-                # Get activity data
-                activity_data = await self._get_contribution_activity(client, username)
-                languages_data = await self._aggregate_languages(client, username, repos_data)
-
-                return {
-                    "basic_info": {
-                        "username": username,
-                        "name": user_data.get("name", ""),
-                        "bio": user_data.get("bio", ""),
-                        "followers": user_data.get("followers", 0),
-                        "following": user_data.get("following", 0),
-                        "public_repos": user_data.get("public_repos", 0),
-                        "account_created": user_data.get("created_at"),
-                    },
-                    "repositories": top_repos,
-                    "activity_metrics": {
-                        "recent_commits": activity_data.get("total_commits", 0),
-                        "languages": languages_data,
-                        "contribution_streak": activity_data.get("contribution_streak", 0)
-                    }
-                }
+                )
+            )
+            if not user_data:
+                return None
+            repos_data = repos_data or []
+
+            # Languages are fetched once per repo and shared between the
+            # top repositories and the aggregated totals
+            languages_by_repo, activity_data = await asyncio.gather(
+                self._get_languages_by_repo(username, repos_data),
+                self._get_contribution_activity(username)
+            )
+
+            return self._build_developer_data(
+                username, user_data, repos_data, languages_by_repo,
+                self._aggregate_languages(languages_by_repo), activity_data
+            )
         except Exception as e:
             print(f"Error getting developer data for {username}: {str(e)}")
             return None
 
-    async def _get_repo_languages(self, client: httpx.AsyncClient, username: str, repo: str) -> Dict[str, int]:
+    def _build_developer_data(self, username: str, user_data: Dict, repos_data: List[Dict],
+                              languages_by_repo: Dict[str, Dict[str, int]], languages: Dict[str, int],
+                              activity_data: Dict) -> Dict[str, Any]:
+        """Assemble the profile passed to the analyzer from raw API responses"""
+        # Process top repositories
+        top_repos = []
+        for repo in sorted(repos_data, key=lambda x: x.get("stargazers_count", 0), reverse=True)[:5]:
+            top_repos.append({
+                "name": repo.get("name", ""),
+                "description": repo.get("description", ""),
+                "stars": repo.get("stargazers_count", 0),
+                "forks": repo.get("forks_count", 0),
+                "languages": languages_by_repo.get(repo.get("name", ""), {}),
+                "last_updated": repo.get("updated_at", ""),
+                "url": repo.get("html_url", "")
+            })
+
+        return {
+            "basic_info": {
+                "username": username,
+                "name": user_data.get("name", ""),
+                "bio": user_data.get("bio", ""),
+                "followers": user_data.get("followers", 0),
+                "following": user_data.get("following", 0),
+                "public_repos": user_data.get("public_repos", 0),
+                "account_created": user_data.get("created_at"),
+            },
+            "repositories": top_repos,
+            "activity_metrics": {
+                "recent_commits": activity_data.get("total_commits", 0),
+                "languages": languages,
+                "contribution_streak": activity_data.get("contribution_streak", 0)
+            }
+        }
+
+    async def refresh_developer_data(self, username: str, state: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Bring a stored profile up to date with as few requests as possible
+
+        state holds what the last refresh saw: per-repo pushed_at and
+        languages, the language totals, retained recent events and the newest
+        event id. Only events newer than that id are fetched, and languages
+        are fetched again only for repos that were pushed to since. Returns
+        the fresh profile and the new state, or None and the old state if
+        GitHub could not be reached.
+        """
+        try:
+            user_data, repos_data = await asyncio.gather(
+                self._make_github_request(f"{self.base_url}/users/{username}"),
+                self._make_github_request(
+                    f"{self.base_url}/users/{username}/repos",
+                    params={"sort": "stars", "direction": "desc", "per_page": 100}
+                )
+            )
+            # A failed repo list would make every known repo look deleted
+            if not user_data or repos_data is None:
+                return None, state
+
+            known_repos = state.get("repos", {})
+            changed = [
+                repo for repo in repos_data
+                if repo.get("name", "") not in known_repos
+                or known_repos[repo.get("name", "")].get("pushed_at") != repo.get("pushed_at")
+            ]
+            changed_languages, new_events = await asyncio.gather(
+                asyncio.gather(*(
+                    self._make_github_request(f"{self.base_url}/repos/{username}/{repo.get('name', '')}/languages")
+                    for repo in changed
+                )),
+                self._get_new_events(username, state.get("last_event_id"))
+            )
+            # Repos whose languages could not be fetched keep their previous
+            # state, so the next refresh sees them as changed and retries
+            fetched = {
+                repo.get("name", ""): repo_languages
+                for repo, repo_languages in zip(changed, changed_languages)
+                if repo_languages is not None
+            }
+
+            # Language totals are updated by the difference for changed and
+            # deleted repos rather than summed again from every repo
+            languages = dict(state.get("languages", {}))
+            current_names = {repo.get("name", "") for repo in repos_data}
+            for name, repo_state in known_repos.items():
+                if name in fetched or name not in current_names:
+                    for lang, size in repo_state.get("languages", {}).items():
+                        languages[lang] = languages.get(lang, 0) - size
+            for repo_languages in fetched.values():
+                for lang, size in repo_languages.items():
+                    languages[lang] = languages.get(lang, 0) + size
+            languages = {lang: size for lang, size in languages.items() if size > 0}
+
+            repos = {}
+            for repo in repos_data:
+                name = repo.get("name", "")
+                if name in fetched:
+                    repos[name] = {"pushed_at": repo.get("pushed_at"), "languages": fetched[name]}
+                elif name in known_repos:
+                    repos[name] = known_repos[name]
+
+            # Events are only taken once every page up to the last seen one
+            # was read; otherwise the gap would be skipped for good
+            if new_events is None:
+                new_events, last_event_id = [], state.get("last_event_id")
+            else:
+                new_events, last_event_id = new_events
+
+            # Recent events are kept so the 30-day window can slide forward
+            # as old events expire and new ones arrive
+            cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            events = [
+                event for event in new_events + state.get("events", [])
+                if event["created_at"] > cutoff
+            ]
+            new_state = {
+                "repos": repos,
+                "languages": languages,
+                "events": events,
+                "last_event_id": last_event_id
+            }
+            languages_by_repo = {name: repo["languages"] for name, repo in repos.items()}
+            dev_data = self._build_developer_data(
+                username, user_data, repos_data, languages_by_repo, languages, self._summarize_events(events)
+            )
+            return dev_data, new_state
+        except Exception as e:
+            print(f"Error refreshing developer data for {username}: {str(e)}")
+            return None, state
+
+    async def _get_repo_languages(self, username: str, repo: str) -> Dict[str, int]:
         """Get language breakdown for a repository"""
         return await self._make_github_request(
-            client,
             f"{self.base_url}/repos/{username}/{repo}/languages"
         ) or {}
 
-    async def _aggregate_languages(self, client: httpx.AsyncClient, username: str, repos: List[Dict]) -> Dict[str, int]:
+    async def _get_languages_by_repo(self, username: str, repos: List[Dict]) -> Dict[str, Dict[str, int]]:
+        """Fetch language breakdowns for all repositories concurrently"""
+        names = [repo.get("name", "") for repo in repos]
+        results = await asyncio.gather(
+            *(self._get_repo_languages(username, name) for name in names)
+        )
+        return dict(zip(names, results))
+
+    def _aggregate_languages(self, languages_by_repo: Dict[str, Dict[str, int]]) -> Dict[str, int]:
         """Get aggregated language statistics across all repositories"""
         languages = {}
-        for repo in repos:
-            repo_languages = await self._get_repo_languages(client, username, repo.get("name", ""))
+        for repo_languages in languages_by_repo.values():
             for lang, bytes in repo_languages.items():
                 languages[lang] = languages.get(lang, 0) + bytes
         return languages
 
-    async def _get_contribution_activity(self, client: httpx.AsyncClient, username: str) -> Dict:
+    async def _get_contribution_activity(self, username: str) -> Dict:
         """Get recent contribution activity with better metrics"""
         try:
             events_data = await self._make_github_request(
-                client,
                 f"{self.base_url}/users/{username}/events",
                 params={"per_page": 100}
             ) or []
-            
-            recent_commits = 0
-            contribution_days = set()
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            
-            for event in events_data:
-                if event["type"] in ["PushEvent", "PullRequestEvent", "IssuesEvent"]:
-                    event_date = datetime.strptime(event["created_at"], "%Y-%m-%dT%H:%M:%SZ")
-                    if event_date > thirty_days_ago:
-                        if event["type"] == "PushEvent":
-                            recent_commits += len(event.get("payload", {}).get("commits", []))
-                        contribution_days.add(event_date.date())
-            
-            return {
-                "total_commits": recent_commits,
-                "contribution_streak": len(contribution_days)
-            }
+            return self._summarize_events(
+                event for event in map(self._compact_event, events_data) if event
+            )
         except Exception as e:
             print(f"Error getting contribution activity for {username}: {str(e)}")
             return {
                 "total_commits": 0,
                 "contribution_streak": 0
-            }
\ No newline at end of file
+            }
+
+    async def _get_new_events(self, username: str,
+                              last_event_id: Optional[str]) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Contribution events newer than last_event_id, newest first, plus the
+        id of the newest event of any type; None if a page failed
+
+        Pages are read until the last seen event turns up. An unchanged first
+        page is answered with 304 by the response cache, so a quiet developer
+        costs no rate limit at all.
+        """
+        events = []
+        newest_id = last_event_id
+        for page in range(1, self.event_max_pages + 1):
+            page_data = await self._make_github_request(
+                f"{self.base_url}/users/{username}/events",
+                params={"per_page": 100, "page": page}
+            )
+            if page_data is None:
+                return None
+            if page == 1 and page_data:
+                # The cursor moves on every event, not just the ones kept
+                newest_id = page_data[0]["id"]
+            for event in page_data:
+                if last_event_id and int(event["id"]) <= int(last_event_id):
+                    return events, newest_id
+                compact = self._compact_event(event)
+                if compact:
+                    events.append(compact)
+            if len(page_data) < 100:
+                break
+        return events, newest_id
+
+    def _compact_event(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The parts of an event the activity metrics use, or None if it doesn't count"""
+        if event["type"] not in ["PushEvent", "PullRequestEvent", "IssuesEvent"]:
+            return None
+        return {
+            "id": event["id"],
+            "type": event["type"],
+            "created_at": event["created_at"],
+            "commits": len(event.get("payload", {}).get("commits", [])) if event["type"] == "PushEvent" else 0
+        }
+
+    def _summarize_events(self, events) -> Dict:
+        """Commits and active days over the last 30 days"""
+        recent_commits = 0
+        contribution_days = set()
+        thirty_days_ago = datetime.now() - timedelta(days=30)
+
+        for event in events:
+            event_date = datetime.strptime(event["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+            if event_date > thirty_days_ago:
+                recent_commits += event["commits"]
+                contribution_days.add(event_date.date())
+
+        return {
+            "total_commits": recent_commits,
+            "contribution_streak": len(contribution_days)
+        }
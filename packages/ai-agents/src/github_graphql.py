@@ -0,0 +1,200 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+
+from github_client import GitHubClient
+
+# Everything get_developer_data needs for one user in a single selection
+PROFILE_FRAGMENT = """
+fragment ProfileFields on User {
+  login
+  name
+  bio
+  createdAt
+  followers { totalCount }
+  following { totalCount }
+  repositories(ownerAffiliations: OWNER, privacy: PUBLIC, first: $repoCount,
+               orderBy: {field: STARGAZERS, direction: DESC}) {
+    totalCount
+    nodes {
+      name
+      description
+      stargazerCount
+      forkCount
+      updatedAt
+      url
+      languages(first: $languageCount, orderBy: {field: SIZE, direction: DESC}) {
+        edges { size node { name } }
+      }
+    }
+  }
+  contributionsCollection(from: $since) {
+    totalCommitContributions
+    contributionCalendar {
+      weeks { contributionDays { date contributionCount } }
+    }
+  }
+}
+"""
+
+class GitHubGraphQLClient(GitHubClient):
+    """GitHubClient backend that fetches developer profiles through the GraphQL API
+
+    One aliased query returns the user, their repositories with language
+    sizes and the contribution calendar for several users at once, instead
+    of the N+7 REST calls per user. Discovery still uses the REST search API.
+    """
+
+    def __init__(self, batch_size: int = None, repo_count: int = None, language_count: int = None, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_size = batch_size or int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "5"))
+        self.repo_count = repo_count or int(os.getenv("GITHUB_GRAPHQL_REPO_COUNT", "100"))
+        self.language_count = language_count or int(os.getenv("GITHUB_GRAPHQL_LANGUAGE_COUNT", "20"))
+
+    def _build_profiles_query(self, count: int) -> str:
+        """Aliased query fetching `count` users, logins passed as $login0..$loginN"""
+        login_vars = "".join(f", $login{i}: String!" for i in range(count))
+        selections = "\n".join(
+            f"  user{i}: user(login: $login{i}) {{ ...ProfileFields }}" for i in range(count)
+        )
+        return (
+            f"query Profiles($repoCount: Int!, $languageCount: Int!, $since: DateTime!{login_vars}) {{\n"
+            f"{selections}\n"
+            "}\n"
+            f"{PROFILE_FRAGMENT}"
+        )
+
+    async def _make_graphql_request(self, query: str, variables: Dict[str, Any]) -> Optional[Dict]:
+        """POST a GraphQL query with the same rate limit handling as REST requests"""
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self.governor.acquire("graphql")
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        response = await self.client.post(
+                            f"{self.base_url}/graphql",
+                            json={"query": query, "variables": variables}
+                        )
+                    except Exception:
+                        self._record_request(f"{self.base_url}/graphql", "error", time.perf_counter() - started)
+                        raise
+                    self._record_request(f"{self.base_url}/graphql", response.status_code, time.perf_counter() - started)
+
+                retry_delay = self.governor.observe("graphql", response)
+                if retry_delay and attempt < self.max_retries:
+                    print(f"GraphQL rate limited. Retrying in {int(retry_delay)} seconds...")
+                    continue
+                response.raise_for_status()
+
+                payload = response.json()
+                errors = payload.get("errors") or []
+                if any(error.get("type") == "RATE_LIMITED" for error in errors) and attempt < self.max_retries:
+                    self.governor.block("graphql", self.governor.secondary_backoff)
+                    continue
+
+                # Unknown logins come back as NOT_FOUND errors next to partial data
+                for error in errors:
+                    if error.get("type") != "NOT_FOUND":
+                        print(f"GraphQL error: {error.get('message')}")
+                return payload.get("data")
+        except Exception as e:
+            print(f"Error making GraphQL request: {str(e)}")
+            return None
+
+    async def get_developers_data(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get developer data for many users, several per GraphQL query"""
+        batches = [usernames[i:i + self.batch_size] for i in range(0, len(usernames), self.batch_size)]
+        results = await asyncio.gather(*(self._fetch_batch(batch) for batch in batches))
+
+        developers = {}
+        for batch_result in results:
+            developers.update(batch_result)
+        return developers
+
+    async def _fetch_developer_data(self, username: str) -> Dict[str, Any]:
+        """Get comprehensive developer data in a single GraphQL query"""
+        return (await self._fetch_batch([username])).get(username)
+
+    async def _fetch_batch(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        variables = {
+            "repoCount": self.repo_count,
+            "languageCount": self.language_count,
+            "since": (now - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        for i, username in enumerate(usernames):
+            variables[f"login{i}"] = username
+
+        data = await self._make_graphql_request(self._build_profiles_query(len(usernames)), variables) or {}
+
+        developers = {}
+        for i, username in enumerate(usernames):
+            user = data.get(f"user{i}")
+            try:
+                developers[username] = self._to_developer_data(username, user, now) if user else None
+            except Exception as e:
+                print(f"Error getting developer data for {username}: {str(e)}")
+                developers[username] = None
+        return developers
+
+    def _to_developer_data(self, username: str, user: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Map a GraphQL user into the same shape the REST backend returns"""
+        repositories = user.get("repositories") or {}
+        repo_nodes = [repo for repo in repositories.get("nodes") or [] if repo]
+
+        languages_by_repo = {
+            repo["name"]: {
+                edge["node"]["name"]: edge["size"]
+                for edge in (repo.get("languages") or {}).get("edges") or []
+            }
+            for repo in repo_nodes
+        }
+
+        top_repos = []
+        for repo in sorted(repo_nodes, key=lambda x: x.get("stargazerCount", 0), reverse=True)[:5]:
+            top_repos.append({
+                "name": repo.get("name", ""),
+                "description": repo.get("description", ""),
+                "stars": repo.get("stargazerCount", 0),
+                "forks": repo.get("forkCount", 0),
+                "languages": languages_by_repo.get(repo.get("name", ""), {}),
+                "last_updated": repo.get("updatedAt", ""),
+                "url": repo.get("url", "")
+            })
+
+        # Days with any contribution in the last 30 days, like the REST event scan
+        contributions = user.get("contributionsCollection") or {}
+        thirty_days_ago = (now - timedelta(days=30)).date().isoformat()
+        contribution_days = [
+            day
+            for week in (contributions.get("contributionCalendar") or {}).get("weeks", [])
+            for day in week.get("contributionDays", [])
+            if day["contributionCount"] > 0 and day["date"] > thirty_days_ago
+        ]
+
+        return {
+            "basic_info": {
+                "username": username,
+                "name": user.get("name", ""),
+                "bio": user.get("bio", ""),
+                "followers": (user.get("followers") or {}).get("totalCount", 0),
+                "following": (user.get("following") or {}).get("totalCount", 0),
+                "public_repos": repositories.get("totalCount", 0),
+                "account_created": user.get("createdAt"),
+            },
+            "repositories": top_repos,
+            "activity_metrics": {
+                "recent_commits": contributions.get("totalCommitContributions", 0),
+                "languages": self._aggregate_languages(languages_by_repo),
+                "contribution_streak": len(contribution_days)
+            }
+        }
+
+def create_github_client(**kwargs) -> GitHubClient:
+    """Build the GitHub backend selected by GITHUB_BACKEND ("rest" or "graphql")"""
+    if os.getenv("GITHUB_BACKEND", "rest").lower() == "graphql":
+        return GitHubGraphQLClient(**kwargs)
+    return GitHubClient(**kwargs)
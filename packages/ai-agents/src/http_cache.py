@@ -0,0 +1,112 @@
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from sqlite_store import SQLiteStore, data_path
+
+class GitHubResponseCache(SQLiteStore):
+    """On-disk cache of GitHub API responses revalidated with conditional requests
+
+    Entries keep the response body together with its ETag/Last-Modified
+    validators. Responses answered with 304 Not Modified are served from the
+    cache and do not count against the GitHub rate limit.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+    """
+
+    def __init__(self, path: str = None, ttl: float = None, max_bytes: int = None):
+        super().__init__(path or os.getenv("GITHUB_CACHE_PATH") or data_path("github_cache.sqlite"))
+        # Entries that have not been revalidated within the TTL are dropped
+        self.ttl = ttl if ttl is not None else float(os.getenv("GITHUB_CACHE_TTL", str(7 * 24 * 3600)))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("GITHUB_CACHE_MAX_MB", "200")) * 1024 * 1024
+        self._total_size = self.fetchone("SELECT COALESCE(SUM(size), 0) FROM responses")[0]
+
+    @staticmethod
+    def make_key(url: str, params: Dict = None) -> str:
+        """Cache key for a request, independent of parameter order"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, or None if missing or expired"""
+        row = self.fetchone("SELECT * FROM responses WHERE key = ?", (key,))
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row["stored_at"] > self.ttl:
+            self._delete(key, row["size"])
+            return None
+
+        self.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return dict(row)
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Validators to send with a request for a cached entry"""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, key: str, entry: Dict[str, Any]) -> Any:
+        """Refresh an entry after a 304 response and return its decoded body"""
+        now = time.time()
+        self.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+        return json.loads(entry["body"])
+
+    def store(self, key: str, response: httpx.Response):
+        """Store a successful response if GitHub sent validators for it"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        body = response.content
+        now = time.time()
+        with self._lock:
+            previous = self.fetchone("SELECT size FROM responses WHERE key = ?", (key,))
+            self.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, len(body), now, now)
+            )
+            self._total_size += len(body) - (previous["size"] if previous else 0)
+            if self._total_size > self.max_bytes:
+                self._evict()
+
+    def _delete(self, key: str, size: int):
+        with self._lock:
+            self.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_size -= size
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under the size limit"""
+        with self._lock:
+            self.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+            self._total_size = self.fetchone("SELECT COALESCE(SUM(size), 0) FROM responses")[0]
+
+            # Leave some headroom so eviction doesn't run on every insert
+            target = self.max_bytes * 0.9
+            for row in self.fetchall("SELECT key, size FROM responses ORDER BY accessed_at"):
+                if self._total_size <= target:
+                    break
+                self._delete(row["key"], row["size"])
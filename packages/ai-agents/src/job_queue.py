@@ -0,0 +1,191 @@
+import json
+import os
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlite_store import SQLiteStore, data_path
+
+class JobQueue(SQLiteStore):
+    """Durable job queue shared by worker processes
+
+    Jobs are claimed under a lease: a worker that dies mid-job loses the
+    lease and the job becomes claimable again. Failed jobs are retried with
+    exponential backoff until they run out of attempts and are marked dead.
+    An idempotency key per kind (the GitHub username) makes enqueueing the
+    same work twice a no-op while it is queued or running.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            idempotency_key TEXT,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            available_at REAL NOT NULL,
+            lease_expires_at REAL,
+            worker TEXT,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            UNIQUE (kind, idempotency_key)
+        );
+        CREATE INDEX IF NOT EXISTS jobs_claimable ON jobs (kind, status, available_at);
+    """
+
+    def __init__(self, path: str = None):
+        super().__init__(path or os.getenv("JOB_QUEUE_PATH") or data_path("jobs.sqlite"))
+        self.max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+        self.backoff_base = float(os.getenv("JOB_BACKOFF_BASE", "10"))
+        self.backoff_max = float(os.getenv("JOB_BACKOFF_MAX", "900"))
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], key: str = None,
+                max_attempts: int = None, delay: float = 0) -> Dict[str, Any]:
+        """Add a job and return it
+
+        A key seen before returns the existing job. It is queued again with
+        the new payload if it already finished or died, or if the payload
+        changed; a job whose payload changed while running is picked up
+        again once its current lease is over.
+        """
+        now = time.time()
+        key = key.lower() if key else None
+        payload = json.dumps(payload, default=str)
+        max_attempts = max_attempts or self.max_attempts
+        with self._lock:
+            cursor = self.execute(
+                "INSERT OR IGNORE INTO jobs "
+                "(kind, idempotency_key, payload, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, key, payload, max_attempts, now + delay, now, now)
+            )
+            if cursor.rowcount:
+                return self.get(cursor.lastrowid)
+
+            row = self.fetchone("SELECT * FROM jobs WHERE kind = ? AND idempotency_key = ?", (kind, key))
+            if row["status"] in ("pending", "running") and row["payload"] == payload:
+                return self._to_job(row)
+
+            available_at = now + delay
+            if row["status"] == "running":
+                available_at = max(available_at, row["lease_expires_at"] or now)
+            self.execute(
+                "UPDATE jobs SET status = 'pending', payload = ?, attempts = 0, max_attempts = ?, available_at = ?, "
+                "lease_expires_at = NULL, worker = NULL, result = NULL, error = NULL, updated_at = ? WHERE id = ?",
+                (payload, max_attempts, available_at, now, row["id"])
+            )
+            return self.get(row["id"])
+
+    def claim(self, kinds: Iterable[str], worker: str, lease: float) -> Optional[Dict[str, Any]]:
+        """Lease the next due job of the given kinds, or None if there is none"""
+        kinds = list(kinds)
+        placeholders = ",".join("?" for _ in kinds)
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front so two processes can't
+            # claim the same row
+            self.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.fetchone(
+                    f"SELECT * FROM jobs WHERE kind IN ({placeholders}) AND ("
+                    "(status = 'pending' AND available_at <= ?) OR "
+                    "(status = 'running' AND lease_expires_at <= ?)"
+                    ") ORDER BY available_at, id LIMIT 1",
+                    (*kinds, now, now)
+                )
+                if row is None:
+                    self.execute("COMMIT")
+                    return None
+                self.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, "
+                    "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (worker, now + lease, now, row["id"])
+                )
+                self.execute("COMMIT")
+            except Exception:
+                self.execute("ROLLBACK")
+                raise
+
+        job = self._to_job(row)
+        job.update(status="running", attempts=job["attempts"] + 1, worker=worker, lease_expires_at=now + lease)
+        return job
+
+    def ack(self, job_id: int, result: Any = None):
+        """Mark a job done"""
+        self.execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_expires_at = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'running'",
+            (json.dumps(result, default=str), time.time(), job_id)
+        )
+
+    def fail(self, job_id: int, error: str):
+        """Schedule a retry with backoff, or mark the job dead once out of attempts"""
+        with self._lock:
+            # A job queued again while running is left to its next run
+            row = self.fetchone("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'running'", (job_id,))
+            if row is None:
+                return
+            now = time.time()
+            if row["attempts"] >= row["max_attempts"]:
+                self.execute(
+                    "UPDATE jobs SET status = 'dead', error = ?, lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                    (error, now, job_id)
+                )
+                return
+
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (row["attempts"] - 1))
+            delay *= random.uniform(0.8, 1.2)
+            self.execute(
+                "UPDATE jobs SET status = 'pending', error = ?, available_at = ?, lease_expires_at = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (error, now + delay, now, job_id)
+            )
+
+    def release(self, job_id: int):
+        """Give a claimed job back without counting the attempt, e.g. on shutdown"""
+        self.execute(
+            "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_expires_at = NULL, "
+            "updated_at = ? WHERE id = ? AND status = 'running'",
+            (time.time(), job_id)
+        )
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self.fetchone("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._to_job(row) if row else None
+
+    def jobs(self, kind: str = None, status: str = None) -> List[Dict[str, Any]]:
+        sql, params = "SELECT * FROM jobs WHERE 1 = 1", []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        return [self._to_job(row) for row in self.fetchall(sql + " ORDER BY id", params)]
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of jobs per kind and status"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in self.fetchall("SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status"):
+            counts.setdefault(row["kind"], {})[row["status"]] = row["n"]
+        return counts
+
+    def has_open_jobs(self, kinds: Iterable[str]) -> bool:
+        kinds = list(kinds)
+        placeholders = ",".join("?" for _ in kinds)
+        row = self.fetchone(
+            f"SELECT 1 FROM jobs WHERE kind IN ({placeholders}) AND status IN ('pending', 'running') LIMIT 1",
+            kinds
+        )
+        return row is not None
+
+    @staticmethod
+    def _to_job(row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+TERMINAL_STATES = ("done", "failed")
+
+class Job:
+    """A background job whose progress can be polled or streamed"""
+
+    def __init__(self, key: Hashable):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+    async def update(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+        if self.finished and self.finished_at is None:
+            self.finished_at = time.time()
+        async with self._changed:
+            self.events.append(self.to_dict())
+            self._changed.notify_all()
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every state change, starting with the current state, until the job ends"""
+        # Snapshot the state and event count together so nothing recorded
+        # while the consumer handles the first item is skipped
+        current = self.to_dict()
+        seen = len(self.events)
+        yield current
+
+        # Stop on the terminal event itself: update() sets the status
+        # before its event is appended
+        while current["status"] not in TERMINAL_STATES:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.events) > seen)
+                new_events = self.events[seen:]
+                seen = len(self.events)
+            for event in new_events:
+                current = event
+                yield event
+
+class JobManager:
+    """Runs jobs in the background with coalescing and a short-lived result cache
+
+    Submitting a key that already has a job in flight returns that job, and
+    a key whose job finished successfully within the TTL gets the finished
+    job back instead of running again.
+    """
+
+    def __init__(self,
+                 handler: Callable[..., Awaitable[Any]],
+                 max_concurrency: int = None,
+                 result_ttl: float = None):
+        self.handler = handler
+        self.max_concurrency = max_concurrency or int(os.getenv("JOB_MAX_CONCURRENCY", "4"))
+        self.result_ttl = result_ttl if result_ttl is not None else float(os.getenv("JOB_RESULT_TTL", "600"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[Hashable, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def submit(self, key: Hashable, *args, **kwargs) -> Job:
+        """Start a job for key, or return the in-flight or recent one"""
+        self._prune()
+        job = self._by_key.get(key)
+        if job is not None and job.status != "failed":
+            return job
+
+        job = Job(key)
+        self._jobs[job.id] = job
+        self._by_key[key] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, args, kwargs))
+        return job
+
+    async def _run(self, job: Job, args, kwargs):
+        try:
+            async with self._semaphore:
+                await job.update(status="running")
+
+                async def progress(stage: str):
+                    await job.update(stage=stage)
+
+                result = await self.handler(*args, progress=progress, **kwargs)
+            await job.update(status="done", result=result)
+        except Exception as e:
+            print(f"Job {job.id} failed: {str(e)}")
+            await job.update(status="failed", error=str(e))
+        finally:
+            self._tasks.pop(job.id, None)
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.result_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and job.finished_at < cutoff:
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+
+    async def aclose(self):
+        """Cancel jobs that are still running"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
@@ -0,0 +1,229 @@
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cached lookups up to receipt waits
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        REGISTRY.register(self)
+
+    def labels(self, *values, **labels):
+        if labels:
+            values = tuple(str(labels[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._new_child()
+            return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_text(self, values: Tuple[str, ...], extra: Dict[str, str] = None) -> str:
+        pairs = list(zip(self.labelnames, values)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+class Counter(_Metric):
+    """Monotonically increasing count, exposed as <name>_total"""
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        # HELP and TYPE have to name the metric the way its samples do
+        super().__init__(name if name.endswith("_total") else f"{name}_total", documentation, labelnames)
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        return [(self.name, self._label_text(values), child.value)
+                for values, child in sorted(self._children.items())]
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+    type = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def samples(self):
+        return [(self.name, self._label_text(values), child.value)
+                for values, child in sorted(self._children.items())]
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self):
+        samples = []
+        for values, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", self._label_text(values, {"le": repr(float(bound))}), cumulative))
+            samples.append((f"{self.name}_bucket", self._label_text(values, {"le": "+Inf"}), child.count))
+            samples.append((f"{self.name}_sum", self._label_text(values), child.sum))
+            samples.append((f"{self.name}_count", self._label_text(values), child.count))
+        return samples
+
+class Registry:
+    """Holds every metric of the process and renders them for Prometheus"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Every sample as JSON-friendly data"""
+        return {
+            metric.name: [{"sample": name, "labels": labels, "value": value} for name, labels, value in metric.samples()]
+            for metric in self._metrics
+        }
+
+REGISTRY = Registry()
+
+# GitHub
+GITHUB_REQUESTS = Counter("github_requests", "GitHub API responses by endpoint and status", ["endpoint", "status"])
+GITHUB_REQUEST_SECONDS = Histogram("github_request_seconds", "GitHub API request latency", ["endpoint"])
+GITHUB_RATE_LIMIT_REMAINING = Gauge("github_rate_limit_remaining", "Requests left in the current rate limit window", ["resource"])
+
+# OpenAI
+OPENAI_REQUESTS = Counter("openai_requests", "Chat completion requests by model and status", ["model", "status"])
+OPENAI_REQUEST_SECONDS = Histogram("openai_request_seconds", "Chat completion latency", ["model"])
+OPENAI_TOKENS = Counter("openai_tokens", "Tokens used by chat completions", ["model", "kind"])
+
+# Chain
+RPC_CALLS = Counter("rpc_calls", "JSON-RPC calls by method and outcome", ["method", "status"])
+RPC_CALL_SECONDS = Histogram("rpc_call_seconds", "JSON-RPC call latency", ["method"])
+TX_SENT = Counter("tx_sent", "Transactions broadcast, including replacements", ["kind"])
+TX_GAS_USED = Counter("tx_gas_used", "Gas used by mined transactions", ["status"])
+TX_CONFIRMATION_SECONDS = Histogram("tx_confirmation_seconds", "Time from first broadcast to receipt")
+
+# Pipeline
+PIPELINE_ITEMS = Counter("pipeline_items", "Items handled per pipeline stage", ["stage"])
+PIPELINE_STAGE_SECONDS = Histogram("pipeline_stage_seconds", "Handler latency per pipeline stage", ["stage"])
+
+class _Trace:
+    """Optional per-call event log, written as JSON at exit when METRICS_TRACE_PATH is set"""
+
+    def __init__(self):
+        self.path: Optional[str] = os.getenv("METRICS_TRACE_PATH")
+        self.max_events = int(os.getenv("METRICS_TRACE_MAX_EVENTS", "100000"))
+        self.started_at = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        if self.path:
+            atexit.register(self.dump)
+
+    def record(self, kind: str, name: str, seconds: float, **attributes):
+        if not self.path:
+            return
+        with self._lock:
+            if len(self.events) < self.max_events:
+                self.events.append({
+                    "kind": kind,
+                    "name": name,
+                    "at": time.time() - self.started_at,
+                    "seconds": seconds,
+                    **attributes
+                })
+
+    def dump(self, path: str = None):
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            trace = {"started_at": self.started_at, "events": list(self.events), "metrics": REGISTRY.snapshot()}
+        with open(path, "w") as f:
+            json.dump(trace, f, indent=2, default=str)
+        print(f"Wrote metrics trace to {path}")
+
+TRACE = _Trace()
+
+def render() -> str:
+    return REGISTRY.render()
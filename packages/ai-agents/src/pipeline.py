@@ -0,0 +1,170 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Union, Iterable
+
+import metrics
+
+# Marks the end of the stream on a queue
+_DONE = object()
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percentile // 100))
+    return ordered[int(rank) - 1]
+
+class _Stage:
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Any]], workers: int,
+                 batch_size: int = 1, max_wait: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.processed = 0
+        self.latencies: List[float] = []
+
+class Pipeline:
+    """Staged asyncio pipeline connected by bounded queues
+
+    Items from the source flow through each stage in order. A stage handler
+    returns the item for the next stage, or None to drop it. Stages run
+    their own worker tasks, so they overlap, and the bounded queues apply
+    backpressure: a slow stage stops upstream stages from running ahead.
+    """
+
+    def __init__(self, queue_size: int = 10):
+        self.queue_size = queue_size
+        self.stages: List[_Stage] = []
+        self._tasks: List[asyncio.Task] = []
+        self._stopped = False
+
+    def add_stage(self, name: str, handler: Callable[[Any], Awaitable[Any]], workers: int = 1) -> "Pipeline":
+        self.stages.append(_Stage(name, handler, max(1, workers)))
+        return self
+
+    def add_batch_stage(self, name: str, handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                        batch_size: int, max_wait: float = 0.5, workers: int = 1) -> "Pipeline":
+        """Add a stage whose handler takes a list of items and returns a list of results
+
+        Items are collected until the batch is full or max_wait seconds have
+        passed since its first item; None results are dropped.
+        """
+        self.stages.append(_Stage(name, handler, max(1, workers), max(1, batch_size), max_wait))
+        return self
+
+    def stop(self):
+        """Stop all stages early, e.g. once enough items have been processed"""
+        self._stopped = True
+        for task in self._tasks:
+            task.cancel()
+
+    async def run(self, source: Union[AsyncIterator[Any], Iterable[Any]]):
+        """Feed the source through every stage and wait until the pipeline drains"""
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        self._stopped = False
+        self._tasks = [asyncio.create_task(self._feed(source, queues[0], self.stages[0].workers))]
+
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            next_workers = self.stages[index + 1].workers if output is not None else 0
+            remaining = [stage.workers]
+            for _ in range(stage.workers):
+                self._tasks.append(asyncio.create_task(
+                    self._work(stage, queues[index], output, next_workers, remaining)
+                ))
+
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            if not self._stopped:
+                raise
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Items processed and latency distribution per stage"""
+        return {
+            stage.name: {
+                "processed": stage.processed,
+                "mean_seconds": sum(stage.latencies) / len(stage.latencies) if stage.latencies else 0.0,
+                "p50_seconds": _percentile(stage.latencies, 50),
+                "p99_seconds": _percentile(stage.latencies, 99),
+                "max_seconds": max(stage.latencies, default=0.0)
+            }
+            for stage in self.stages
+        }
+
+    async def _feed(self, source, queue: asyncio.Queue, workers: int):
+        if hasattr(source, "__aiter__"):
+            async for item in source:
+                await queue.put(item)
+        else:
+            for item in source:
+                await queue.put(item)
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    async def _work(self, stage: _Stage, queue: asyncio.Queue, output: asyncio.Queue,
+                    next_workers: int, remaining: List[int]):
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is _DONE:
+                break
+
+            if stage.batch_size > 1:
+                batch, finished = await self._collect_batch(stage, queue, item)
+                results = await self._handle(stage, batch, len(batch)) or []
+            else:
+                results = [await self._handle(stage, item, 1)]
+
+            if output is not None:
+                for result in results:
+                    if result is not None:
+                        await output.put(result)
+
+        # The last worker of a stage to finish closes the next stage
+        remaining[0] -= 1
+        if remaining[0] == 0 and output is not None:
+            for _ in range(next_workers):
+                await output.put(_DONE)
+
+    async def _handle(self, stage: _Stage, item: Any, count: int) -> Any:
+        started = time.perf_counter()
+        try:
+            return await stage.handler(item)
+        except Exception as e:
+            print(f"Error in {stage.name} stage: {str(e)}")
+            return None
+        finally:
+            elapsed = time.perf_counter() - started
+            stage.latencies.append(elapsed)
+            stage.processed += count
+            metrics.PIPELINE_STAGE_SECONDS.labels(stage=stage.name).observe(elapsed)
+            metrics.PIPELINE_ITEMS.labels(stage=stage.name).inc(count)
+            metrics.TRACE.record("pipeline", stage.name, elapsed, items=count)
+
+    async def _collect_batch(self, stage: _Stage, queue: asyncio.Queue, first: Any):
+        """Gather up to batch_size items; returns the batch and whether the stream ended"""
+        batch = [first]
+        deadline = time.monotonic() + stage.max_wait
+        while len(batch) < stage.batch_size:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                # Polling instead of wait_for(queue.get()) so a timeout can
+                # never drop an item that arrived at the same moment
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(0.05, remaining))
+                continue
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
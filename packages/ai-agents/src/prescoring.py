@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from developer_snapshots import DeveloperSnapshotStore
+from github_graphql import create_github_client
+from sqlite_store import data_path
+
+# Age assumed for profiles without a dated repository
+NO_PUSH_DAYS = 3650
+
+def _days_since(timestamp: str, now: datetime) -> float:
+    try:
+        pushed = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return NO_PUSH_DAYS
+    return (now - pushed).total_seconds() / 86400
+
+class CandidateTable:
+    """Columnar profile features for many candidates, one row per username"""
+
+    def __init__(self, usernames: List[str], followers, stars, solidity_repos, days_since_push,
+                 recent_commits, contribution_streak):
+        self.usernames = list(usernames)
+        self.followers = np.asarray(followers, dtype=np.int64)
+        self.stars = np.asarray(stars, dtype=np.int64)
+        self.solidity_repos = np.asarray(solidity_repos, dtype=np.int64)
+        self.days_since_push = np.asarray(days_since_push, dtype=np.float64)
+        self.recent_commits = np.asarray(recent_commits, dtype=np.int64)
+        self.contribution_streak = np.asarray(contribution_streak, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+    @classmethod
+    def from_profiles(cls, profiles: Sequence[Tuple[str, Dict[str, Any]]]) -> "CandidateTable":
+        """Build a table from (username, dev_data) pairs as returned by get_developer_data"""
+        now = datetime.now(timezone.utc)
+        columns = ([], [], [], [], [], [])
+        for _, dev_data in profiles:
+            repos = dev_data.get("repositories", [])
+            activity = dev_data.get("activity_metrics", {})
+            pushes = [repo["last_updated"] for repo in repos if repo.get("last_updated")]
+            row = (
+                dev_data.get("basic_info", {}).get("followers", 0) or 0,
+                sum(repo.get("stars", 0) or 0 for repo in repos),
+                sum(1 for repo in repos if "Solidity" in (repo.get("languages") or {})),
+                _days_since(max(pushes), now) if pushes else NO_PUSH_DAYS,
+                activity.get("recent_commits", 0) or 0,
+                activity.get("contribution_streak", 0) or 0
+            )
+            for column, value in zip(columns, row):
+                column.append(value)
+        return cls([username for username, _ in profiles], *columns)
+
+class Prescorer:
+    """Cheap vectorized ranking used to decide which candidates reach the LLM
+
+    The score extends _calculate_initial_reputation with Solidity work,
+    push recency and contribution days. Only candidates scoring at least
+    the threshold are analyzed. The threshold comes from PRESCORE_THRESHOLD
+    or else from the last calibration against past confidence scores, and
+    is 0, letting everyone through, until one has been run.
+    """
+
+    SOLIDITY_REPO_POINTS = 25
+    MAX_SOLIDITY_REPOS = 4
+    RECENCY_POINTS = 50
+    RECENCY_DAYS = 90
+    STREAK_POINTS = 2
+    MAX_STREAK_DAYS = 30
+
+    def __init__(self, threshold: float = None, calibration_path: str = None):
+        self.calibration_path = calibration_path or os.getenv("PRESCORE_CALIBRATION_PATH") or data_path("prescore_calibration.json")
+        self.target_recall = float(os.getenv("PRESCORE_TARGET_RECALL", "0.9"))
+        self.min_samples = int(os.getenv("PRESCORE_MIN_SAMPLES", "5"))
+
+        if threshold is None and os.getenv("PRESCORE_THRESHOLD"):
+            threshold = float(os.getenv("PRESCORE_THRESHOLD"))
+        if threshold is None:
+            threshold = (self.load_calibration() or {}).get("threshold", 0.0)
+        self.threshold = threshold
+
+    def score(self, table: CandidateTable) -> np.ndarray:
+        """Score every row of the table at once"""
+        reputation = (
+            np.minimum(table.followers // 10, 100)
+            + np.minimum(table.stars // 50, 200)
+            + np.minimum(table.recent_commits // 5, 50)
+        )
+        return (
+            reputation
+            + self.SOLIDITY_REPO_POINTS * np.minimum(table.solidity_repos, self.MAX_SOLIDITY_REPOS)
+            + self.RECENCY_POINTS * np.exp(-np.maximum(table.days_since_push, 0) / self.RECENCY_DAYS)
+            + self.STREAK_POINTS * np.minimum(table.contribution_streak, self.MAX_STREAK_DAYS)
+        )
+
+    def select(self, table: CandidateTable, top_k: int = None) -> np.ndarray:
+        """Row indices at or above the threshold, best first, at most top_k of them"""
+        scores = self.score(table)
+        order = np.argsort(-scores, kind="stable")
+        order = order[scores[order] >= self.threshold]
+        return order[:top_k] if top_k is not None else order
+
+    def filter(self, profiles: List[Tuple[str, Dict[str, Any]]], top_k: int = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """The (username, dev_data) pairs worth an LLM analysis, best first"""
+        if not profiles:
+            return []
+        table = CandidateTable.from_profiles(profiles)
+        selected = self.select(table, top_k)
+        if len(selected) < len(profiles):
+            kept = {table.usernames[i] for i in selected}
+            skipped = [username for username in table.usernames if username not in kept]
+            print(f"Prescoring skipped {len(skipped)} of {len(profiles)} candidates: {', '.join(skipped)}")
+        return [profiles[i] for i in selected]
+
+    def calibrate(self, profiles: List[Tuple[str, Dict[str, Any]]], confidence_scores: Dict[str, float],
+                  min_confidence: float) -> Optional[Dict[str, Any]]:
+        """Pick the threshold that keeps target_recall of past qualifying developers
+
+        confidence_scores are earlier LLM scores by username. The threshold
+        is the prescore percentile below which only 1 - target_recall of the
+        developers who reached min_confidence fall.
+        """
+        qualified = [(username, dev_data) for username, dev_data in profiles
+                     if confidence_scores.get(username, 0) >= min_confidence]
+        if len(qualified) < self.min_samples:
+            print(f"Need at least {self.min_samples} qualified developers to calibrate, have {len(qualified)}")
+            return None
+
+        scores = self.score(CandidateTable.from_profiles(qualified))
+        calibration = {
+            "threshold": float(np.percentile(scores, (1 - self.target_recall) * 100)),
+            "target_recall": self.target_recall,
+            "min_confidence": min_confidence,
+            "samples": len(qualified),
+            "calibrated_at": time.time()
+        }
+        os.makedirs(os.path.dirname(self.calibration_path) or ".", exist_ok=True)
+        with open(self.calibration_path, "w") as f:
+            json.dump(calibration, f, indent=2)
+        self.threshold = calibration["threshold"]
+        return calibration
+
+    def load_calibration(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.calibration_path):
+            return None
+        with open(self.calibration_path) as f:
+            return json.load(f)
+
+def load_confidence_scores(results_path: str) -> Dict[str, float]:
+    """Confidence scores by username from a registration_results.json file"""
+    with open(results_path) as f:
+        results = json.load(f)
+    return {
+        registration["username"]: registration["analysis"]["confidence_score"]
+        for registration in results.get("registrations", [])
+        if registration.get("analysis", {}).get("confidence_score") is not None
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="Calibrate the pre-LLM candidate score")
+    parser.add_argument("--results", default="registration_results.json")
+    parser.add_argument("--min-confidence", type=float, default=65)
+    args = parser.parse_args()
+
+    confidence_scores = load_confidence_scores(args.results)
+    snapshots = DeveloperSnapshotStore()
+    github = create_github_client()
+    try:
+        # Tracked developers are read from their snapshots; the rest are fetched
+        profiles = []
+        for username in confidence_scores:
+            snapshot = snapshots.get(username)
+            dev_data = snapshot["dev_data"] if snapshot else await github.get_developer_data(username)
+            if dev_data:
+                profiles.append((username, dev_data))
+    finally:
+        await github.aclose()
+
+    prescorer = Prescorer(threshold=0.0)
+    calibration = prescorer.calibrate(profiles, confidence_scores, args.min_confidence)
+    if calibration:
+        print(json.dumps(calibration, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,190 @@
+import asyncio
+import os
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+import httpx
+
+import metrics
+
+class _ResourceBudget:
+    """Token bucket for one GitHub rate limit resource (core, search, ...)"""
+
+    def __init__(self, name: str, limit: int, window: float):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = time.time() + window
+        self.blocked_until = 0.0
+        self.next_slot = 0.0
+        self.secondary_strikes = 0
+        self.lock = asyncio.Lock()
+
+class RateLimitGovernor:
+    """Paces GitHub requests using the X-RateLimit-* headers of each response
+
+    Every request takes a token from the budget of its resource class. While
+    plenty of budget is left requests go out immediately; once the remaining
+    budget drops below the reserve, requests are spread evenly over the time
+    left until the reset. Exhausted budgets, Retry-After and secondary rate
+    limits block the resource until GitHub allows requests again.
+    """
+
+    DEFAULT_LIMITS = {
+        "core": (5000, 3600),
+        "search": (30, 60),
+        "graphql": (5000, 3600),
+    }
+
+    def __init__(self, reserve_fraction: float = None, secondary_backoff: float = None):
+        self.reserve_fraction = reserve_fraction if reserve_fraction is not None else float(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "0.1"))
+        self.secondary_backoff = secondary_backoff if secondary_backoff is not None else float(os.getenv("GITHUB_SECONDARY_BACKOFF", "60"))
+        self._budgets: Dict[str, _ResourceBudget] = {}
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """Rate limit resource class a request URL is counted against"""
+        path = urlparse(url).path
+        if path.startswith("/search/"):
+            return "search"
+        if path.startswith("/graphql"):
+            return "graphql"
+        return "core"
+
+    def _budget(self, resource: str) -> _ResourceBudget:
+        if resource not in self._budgets:
+            limit, window = self.DEFAULT_LIMITS.get(resource, self.DEFAULT_LIMITS["core"])
+            self._budgets[resource] = _ResourceBudget(resource, limit, window)
+        return self._budgets[resource]
+
+    def remaining(self, resource: str) -> int:
+        return self._budget(resource).remaining
+
+    async def acquire(self, resource: str):
+        """Wait until a request against the resource may be sent"""
+        budget = self._budget(resource)
+        async with budget.lock:
+            while True:
+                now = time.time()
+                if now >= budget.reset_at:
+                    # Window rolled over without fresh headers; assume a full budget
+                    budget.remaining = budget.limit
+                    budget.reset_at = now + budget.window
+
+                if budget.blocked_until > now:
+                    wait_time = budget.blocked_until - now
+                elif budget.remaining <= 0:
+                    wait_time = budget.reset_at - now + 1
+                elif budget.remaining <= budget.limit * self.reserve_fraction:
+                    # Spread what is left evenly until the window resets
+                    wait_time = budget.next_slot - now
+                    if wait_time <= 0:
+                        budget.next_slot = now + (budget.reset_at - now) / budget.remaining
+                else:
+                    wait_time = 0
+
+                if wait_time <= 0:
+                    budget.remaining -= 1
+                    return
+
+                if wait_time > 5:
+                    print(f"GitHub {resource} rate limit reached. Waiting {int(wait_time)} seconds...")
+                await asyncio.sleep(wait_time)
+
+    def block(self, resource: str, delay: float):
+        """Hold back all requests against a resource for the given number of seconds"""
+        budget = self._budget(resource)
+        budget.blocked_until = max(budget.blocked_until, time.time() + delay)
+
+    def observe(self, resource: str, response: httpx.Response) -> float:
+        """Update budgets from a response; returns seconds to wait before retrying it, or 0"""
+        headers = response.headers
+        now = time.time()
+        budget = self._budget(headers.get("X-RateLimit-Resource", resource))
+
+        if "X-RateLimit-Limit" in headers:
+            budget.limit = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Reset" in headers and "X-RateLimit-Remaining" in headers:
+            reset_at = float(headers["X-RateLimit-Reset"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            if reset_at != budget.reset_at:
+                budget.reset_at = reset_at
+                budget.remaining = remaining
+            else:
+                # Responses to concurrent requests arrive out of order; the
+                # lowest count seen in the current window is the freshest
+                budget.remaining = min(budget.remaining, remaining)
+            metrics.GITHUB_RATE_LIMIT_REMAINING.labels(resource=budget.name).set(budget.remaining)
+
+        if response.status_code not in (403, 429):
+            budget.secondary_strikes = 0
+            return 0
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = budget.reset_at - now + 1
+        elif response.status_code == 429 or "secondary rate limit" in response.text.lower():
+            # Secondary limits without Retry-After: back off exponentially
+            delay = self.secondary_backoff * (2 ** budget.secondary_strikes)
+            budget.secondary_strikes += 1
+        else:
+            # A plain permission error, not a rate limit
+            return 0
+
+        delay = max(delay, 1)
+        self.block(budget.name, delay)
+        return delay
+
+class TokenBudgetLimiter:
+    """Token buckets for a requests-per-minute and a tokens-per-minute limit
+
+    Callers reserve one request and their estimated token count before each
+    call; both buckets refill continuously, so requests are paced to the
+    configured tier limits instead of bursting into 429s.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int):
+        """Wait until one request with the given token estimate fits both budgets"""
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                wait_time = self._blocked_until - time.monotonic()
+                if wait_time <= 0:
+                    if self._requests >= 1 and self._tokens >= tokens:
+                        self._requests -= 1
+                        self._tokens -= tokens
+                        return
+                    wait_time = max(
+                        (1 - self._requests) * 60 / self.requests_per_minute,
+                        (tokens - self._tokens) * 60 / self.tokens_per_minute
+                    )
+                await asyncio.sleep(wait_time)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the real usage of a request is known"""
+        self._tokens = min(self.tokens_per_minute, self._tokens + estimated - actual)
+
+    def pause(self, delay: float):
+        """Hold back all requests, e.g. after the server answered 429"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+from dotenv import load_dotenv
+
+from event_decoder import DecodedEvent
+from sqlite_store import SQLiteStore, data_path
+
+# Events mirrored locally, by contract attribute on the integrator
+INDEXED_EVENTS = {
+    'auto_registration': ['DeveloperAutoRegistered'],
+    'registry': ['DeveloperRegistered', 'TokenAddressSet'],
+    'investment': ['TokenCreated'],
+}
+
+REGISTRATION_EVENTS = ('DeveloperAutoRegistered', 'DeveloperRegistered')
+
+class RegistryIndex(SQLiteStore):
+    """Local SQLite mirror of registration and token events
+
+    Every decoded log is stored with the username, developer and token it
+    refers to, so lookups are indexed local reads. Block hashes of indexed
+    blocks are kept to detect reorgs and roll the mirror back.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS events (
+            block_number INTEGER NOT NULL,
+            block_hash TEXT NOT NULL,
+            tx_hash TEXT NOT NULL,
+            log_index INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            username TEXT,
+            developer TEXT,
+            token TEXT,
+            args TEXT NOT NULL,
+            PRIMARY KEY (tx_hash, log_index)
+        );
+        CREATE INDEX IF NOT EXISTS events_username ON events (username);
+        CREATE INDEX IF NOT EXISTS events_developer ON events (developer);
+        CREATE INDEX IF NOT EXISTS events_block ON events (block_number);
+
+        CREATE TABLE IF NOT EXISTS blocks (
+            number INTEGER PRIMARY KEY,
+            hash TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS cursor (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            block_number INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = None):
+        super().__init__(path or os.getenv("REGISTRY_INDEX_PATH") or data_path("registry_index.sqlite"))
+
+    def cursor(self) -> Optional[int]:
+        """Last block fully indexed, or None before the first sync"""
+        row = self.fetchone("SELECT block_number FROM cursor WHERE id = 0")
+        return row["block_number"] if row else None
+
+    def set_cursor(self, block_number: int, block_hash: str):
+        with self._lock:
+            self.execute("INSERT OR REPLACE INTO cursor (id, block_number) VALUES (0, ?)", (block_number,))
+            self.record_block(block_number, block_hash)
+
+    def record_block(self, block_number: int, block_hash: str):
+        self.execute("INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)", (block_number, block_hash))
+
+    def recent_blocks(self, limit: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.fetchall("SELECT number, hash FROM blocks ORDER BY number DESC LIMIT ?", (limit,))]
+
+    def prune_blocks(self, below: int):
+        self.execute("DELETE FROM blocks WHERE number < ?", (below,))
+
+    def add_event(self, event: DecodedEvent):
+        """Store a decoded event; storing the same log twice is a no-op"""
+        args = event.args
+        username = args.get('githubUsername')
+        developer = args.get('developer') or args.get('developerAddress')
+        token = args.get('tokenAddress')
+        with self._lock:
+            self.execute(
+                "INSERT OR IGNORE INTO events "
+                "(block_number, block_hash, tx_hash, log_index, event, username, developer, token, args) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (event.block_number, event.block_hash, event.tx_hash, event.log_index, event.name, username,
+                 developer.lower() if developer else None, token, json.dumps(args, default=str))
+            )
+            self.record_block(event.block_number, event.block_hash)
+
+    def rollback(self, block_number: int):
+        """Forget everything indexed after a block, e.g. after a reorg"""
+        with self._lock:
+            self.execute("DELETE FROM events WHERE block_number > ?", (block_number,))
+            self.execute("DELETE FROM blocks WHERE number > ?", (block_number,))
+            self.execute("UPDATE cursor SET block_number = MIN(block_number, ?) WHERE id = 0", (block_number,))
+
+    def is_registered(self, github_username: str) -> bool:
+        row = self.fetchone(
+            f"SELECT 1 FROM events WHERE username = ? AND event IN {REGISTRATION_EVENTS} LIMIT 1",
+            (github_username,)
+        )
+        return row is not None
+
+    def developer_for_username(self, github_username: str) -> Optional[str]:
+        row = self.fetchone(
+            "SELECT args FROM events WHERE username = ? AND developer IS NOT NULL ORDER BY block_number DESC LIMIT 1",
+            (github_username,)
+        )
+        if row is None:
+            return None
+        args = json.loads(row["args"])
+        return args.get('developer') or args.get('developerAddress')
+
+    def token_for_username(self, github_username: str) -> Optional[str]:
+        row = self.fetchone(
+            "SELECT token FROM events WHERE username = ? AND token IS NOT NULL ORDER BY block_number DESC LIMIT 1",
+            (github_username,)
+        )
+        return row["token"] if row else None
+
+    def token_for_developer(self, developer_address: str) -> Optional[str]:
+        row = self.fetchone(
+            "SELECT token FROM events WHERE developer = ? AND token IS NOT NULL ORDER BY block_number DESC LIMIT 1",
+            (developer_address.lower(),)
+        )
+        return row["token"] if row else None
+
+class RegistryIndexer:
+    """Backfills and tails registry events from the chain into a RegistryIndex"""
+
+    def __init__(self, integrator, index: RegistryIndex = None):
+        self.integrator = integrator
+        self.w3 = integrator.w3
+        self.index = index or RegistryIndex()
+
+        self.start_block = int(os.getenv("INDEXER_START_BLOCK", "0"))
+        self.chunk_size = int(os.getenv("INDEXER_CHUNK_SIZE", "2000"))
+        self.poll_interval = float(os.getenv("INDEXER_POLL_INTERVAL", "5"))
+        self.reorg_depth = int(os.getenv("INDEXER_REORG_DEPTH", "64"))
+
+        self.decoder = integrator.decoder
+        self.topics = [self.decoder.topic(name) for names in INDEXED_EVENTS.values() for name in names]
+
+    @property
+    def addresses(self) -> List[str]:
+        return [getattr(self.integrator, attr).address for attr in INDEXED_EVENTS]
+
+    async def run(self):
+        """Backfill, then keep tailing new blocks until cancelled"""
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"Error syncing registry index: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def sync(self) -> int:
+        """Index all blocks up to the current head; returns the new cursor"""
+        await self.integrator.connect()
+        await self._handle_reorg()
+
+        head = await self.w3.eth.block_number
+        cursor = self.index.cursor()
+        from_block = self.start_block if cursor is None else cursor + 1
+
+        chunk_size = self.chunk_size
+        while from_block <= head:
+            to_block = min(from_block + chunk_size - 1, head)
+            try:
+                logs = await self.w3.eth.get_logs({
+                    'fromBlock': from_block,
+                    'toBlock': to_block,
+                    'address': self.addresses,
+                    'topics': [self.topics]
+                })
+            except Exception as e:
+                # Providers cap the range or result count of eth_getLogs
+                if chunk_size > 1:
+                    chunk_size = max(1, chunk_size // 2)
+                    print(f"eth_getLogs failed for {from_block}-{to_block} ({str(e)}), retrying with {chunk_size} blocks")
+                    continue
+                raise
+
+            self.ingest_logs(logs)
+            block = await self.w3.eth.get_block(to_block)
+            self.index.set_cursor(to_block, block['hash'].hex())
+            if to_block - from_block + 1 == chunk_size:
+                chunk_size = min(self.chunk_size, chunk_size * 2)
+            from_block = to_block + 1
+
+        self.index.prune_blocks(head - self.reorg_depth)
+        return head
+
+    def ingest_logs(self, logs) -> int:
+        """Decode and store logs from eth_getLogs"""
+        return self.ingest_events(self.decoder.decode_logs(logs))
+
+    def ingest_events(self, events: List[DecodedEvent]) -> int:
+        """Store the mirrored events among already decoded ones"""
+        stored = 0
+        for contract_attr, event_names in INDEXED_EVENTS.items():
+            address = getattr(self.integrator, contract_attr).address.lower()
+            for event in events:
+                if event.name in event_names and event.address.lower() == address:
+                    self.index.add_event(event)
+                    stored += 1
+        return stored
+
+    async def _handle_reorg(self):
+        """Roll back to the newest indexed block that is still canonical"""
+        recent = self.index.recent_blocks(self.reorg_depth)
+        for i, stored in enumerate(recent):
+            block = await self.w3.eth.get_block(stored['number'])
+            if block['hash'].hex() == stored['hash']:
+                if i > 0:
+                    print(f"Reorg detected, rolling registry index back to block {stored['number']}")
+                    self.index.rollback(stored['number'])
+                return
+
+        if recent:
+            # Deeper than we track: re-index the whole tracked window
+            fork_point = recent[-1]['number'] - 1
+            print(f"Deep reorg detected, rolling registry index back to block {fork_point}")
+            self.index.rollback(fork_point)
+
+async def main():
+    from contract_integrator import EnhancedContractIntegrator
+
+    load_dotenv()
+    integrator = EnhancedContractIntegrator()
+    indexer = integrator.indexer or RegistryIndexer(integrator)
+    try:
+        head = await indexer.sync()
+        print(f"Registry index synced to block {head}")
+        await indexer.run()
+    finally:
+        await integrator.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class _Call:
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same result (or exception). Nothing is remembered once
+    the call completes, so later callers start a fresh one. The call is
+    cancelled once every caller awaiting it has been cancelled.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn(*args, **kwargs)))
+            self._calls[key] = call
+            call.future.add_done_callback(lambda done: self._finish(key, call))
+
+        call.waiters += 1
+        try:
+            # A cancelled caller must not cancel the call the others are awaiting
+            return await asyncio.shield(call.future)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.future.done():
+                # The last caller gave up: stop the call and let it wind down
+                # before returning, so it doesn't outlive whoever started it
+                call.future.cancel()
+                await asyncio.wait([call.future])
+
+    def _finish(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not call.future.cancelled():
+            call.future.exception()
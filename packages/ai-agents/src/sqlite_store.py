@@ -0,0 +1,43 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+def data_path(filename: str) -> str:
+    """Resolve a file inside the agents' local data directory"""
+    return os.path.join(os.getenv("AGENT_DATA_DIR", ".agent_data"), filename)
+
+class SQLiteStore:
+    """Base class for the small SQLite-backed stores used by the agents"""
+
+    schema = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit connection shared between threads; access is serialized
+        # through the lock so stores can be used from worker threads as well
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.schema)
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def fetchone(self, sql: str, params=()) -> sqlite3.Row:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,8 @@
 # packages/ai-agents/src/talent_discovery.py
 from typing import List, Dict, Any
-from github_client import GitHubClient
+from github_graphql import create_github_client
 from ai_analyzer import DeveloperAnalyzer
+from developer_snapshots import DeveloperRefresher
 import asyncio
 import json
 import os
@@ -9,10 +10,15 @@ from datetime import datetime
 
 class TalentDiscoveryService:
     def __init__(self):
-        self.github_client = GitHubClient()
+        self.github_client = create_github_client()
         self.analyzer = DeveloperAnalyzer()
         self.discovered_file = "discovered_developers.json"
 
+        # Known developers are refreshed from snapshots; analysis only re-runs
+        # when their profile changed materially
+        self.incremental_refresh = os.getenv("INCREMENTAL_REFRESH_ENABLED", "false").lower() == "true"
+        self.refresher = DeveloperRefresher(self.github_client, self.analyzer)
+
     def load_discovered_developers(self) -> Dict[str, Any]:
         """Load previously discovered developers to avoid duplicates"""
         if os.path.exists(self.discovered_file):
@@ -48,13 +54,18 @@ class TalentDiscoveryService:
                 continue
 
             try:
-                # Get developer data
-                dev_data = await self.github_client.get_developer_data(username)
-                if not dev_data:
-                    continue
+                if self.incremental_refresh:
+                    dev_data, analysis = await self.refresher.refresh(username)
+                    if not dev_data:
+                        continue
+                else:
+                    # Get developer data
+                    dev_data = await self.github_client.get_developer_data(username)
+                    if not dev_data:
+                        continue
 
-                # Analyze developer
-                analysis = self.analyzer.analyze_developer(dev_data)
+                    # Analyze developer
+                    analysis = await self.analyzer.analyze_developer(dev_data)
                 if not analysis:
                     continue
 
@@ -91,7 +102,8 @@ class TalentDiscoveryService:
 
 async def main():
     service = TalentDiscoveryService()
-    discoveries = await service.discover_developers()
+    async with service.github_client:
+        discoveries = await service.discover_developers()
     print(f"Discovered {len(discoveries)} new developers:")
     print(json.dumps(discoveries, indent=2))
 
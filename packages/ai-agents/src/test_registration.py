@@ -9,7 +9,10 @@ async def test_registration():
         print("Starting test registration...")
         
         # Try to register one developer
-        results = await agent.discover_and_register()
+        try:
+            results = await agent.discover_and_register()
+        finally:
+            await agent.aclose()
         
         print("\nRegistration Results:")
         print(json.dumps(results, indent=2))
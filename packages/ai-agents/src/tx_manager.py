@@ -0,0 +1,230 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from eth_account.signers.local import LocalAccount
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+
+from gas_oracle import FeeOracle, GasEstimator
+import metrics
+
+# Node errors meaning our local nonce no longer matches the chain
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid transaction nonce",
+    "nonce has already been used",
+    "replacement transaction underpriced",
+    "already known",
+    "known transaction",
+)
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(fragment in message for fragment in NONCE_ERRORS)
+
+class NonceManager:
+    """Hands out sequential nonces for one account without asking the node each time"""
+
+    def __init__(self, w3: AsyncWeb3, address: str):
+        self.w3 = w3
+        self.address = address
+        self._next_nonce: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def next_nonce(self) -> int:
+        async with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    async def resync(self):
+        """Forget the local counter; the next nonce is read from the node again"""
+        async with self._lock:
+            self._next_nonce = None
+
+class PendingTransaction:
+    """A broadcast transaction whose receipt is tracked in the background"""
+
+    def __init__(self, nonce: int, tx: Dict[str, Any], tx_hash: bytes, contract_function=None):
+        self.nonce = nonce
+        self.tx = tx
+        self.contract_function = contract_function
+        # Every hash broadcast for this nonce, including gas-bumped replacements
+        self.tx_hashes: List[bytes] = [tx_hash]
+        self.created_at = time.time()
+        self.submitted_at = self.created_at
+        self.replacements = 0
+        self.receipt: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    @property
+    def tx_hash(self) -> bytes:
+        return self.tx_hashes[-1]
+
+class TransactionManager:
+    """Signs and broadcasts transactions back to back and tracks their receipts
+
+    Nonces are assigned locally so several transactions can be in flight at
+    once. A background task polls for receipts and replaces transactions
+    that stay pending too long with a gas-bumped copy using the same nonce.
+    """
+
+    def __init__(self, w3: AsyncWeb3, account: LocalAccount):
+        self.w3 = w3
+        self.account = account
+        self.nonces = NonceManager(w3, account.address)
+        self.gas = GasEstimator(w3)
+        self.fees = FeeOracle(w3)
+
+        self.poll_interval = float(os.getenv("TX_POLL_INTERVAL", "2"))
+        self.stuck_after = float(os.getenv("TX_STUCK_AFTER", "90"))
+        self.gas_bump = float(os.getenv("TX_GAS_BUMP", "1.125"))
+        self.max_replacements = int(os.getenv("TX_MAX_REPLACEMENTS", "3"))
+        self.receipt_timeout = float(os.getenv("TX_RECEIPT_TIMEOUT", "600"))
+
+        self._pending: Dict[int, PendingTransaction] = {}
+        self._send_lock = asyncio.Lock()
+        self._tracker: Optional[asyncio.Task] = None
+
+    async def send(self, contract_function, value: int = 0, gas_multiplier: float = None) -> PendingTransaction:
+        """Build, sign and broadcast a transaction without waiting for it to be mined"""
+        # Estimate before taking a nonce so a reverting call leaves no gap
+        gas_limit = await self.gas.gas_limit(contract_function, self.account.address, value, gas_multiplier)
+        fees = await self.fees.fees()
+
+        async with self._send_lock:
+            for attempt in range(2):
+                nonce = await self.nonces.next_nonce()
+                try:
+                    tx = await contract_function.build_transaction({
+                        'from': self.account.address,
+                        'nonce': nonce,
+                        'gas': gas_limit,
+                        'value': value,
+                        **fees
+                    })
+                    tx_hash = await self._broadcast(tx)
+                    break
+                except Exception as e:
+                    # Nothing went out with this nonce (building can fail on
+                    # an RPC error too), so re-read it instead of leaving a gap
+                    await self.nonces.resync()
+                    if attempt == 0 and is_nonce_error(e):
+                        print(f"Nonce {nonce} rejected ({str(e)}), resyncing...")
+                        continue
+                    raise
+
+        metrics.TX_SENT.labels(kind="new").inc()
+        pending = PendingTransaction(nonce, tx, tx_hash, contract_function)
+        self._pending[nonce] = pending
+        if self._tracker is None or self._tracker.done():
+            self._tracker = asyncio.create_task(self._track_receipts())
+        return pending
+
+    async def wait(self, pending: PendingTransaction):
+        """Wait for the receipt of a transaction or one of its replacements"""
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending.receipt), self.receipt_timeout)
+        except asyncio.TimeoutError:
+            await self._abandon(pending, f"No receipt after {self.receipt_timeout:g} seconds")
+            return await pending.receipt
+
+    async def _broadcast(self, tx: Dict[str, Any]) -> bytes:
+        signed_tx = self.account.sign_transaction(tx)
+        tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        print(f"Transaction sent: {tx_hash.hex()} (nonce {tx['nonce']})")
+        return tx_hash
+
+    async def _track_receipts(self):
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            for nonce, pending in list(self._pending.items()):
+                try:
+                    receipt = await self._find_receipt(pending)
+                    if receipt is not None:
+                        print(f"Transaction confirmed in block {receipt.blockNumber}")
+                        del self._pending[nonce]
+                        self._record_receipt(pending, receipt)
+                        if receipt.status == 0 and receipt.gasUsed >= pending.tx['gas'] and pending.contract_function:
+                            # Ran out of gas: re-estimate next time instead of reusing the limit
+                            self.gas.forget(pending.contract_function, pending.tx.get('value', 0))
+                        if not pending.receipt.done():
+                            pending.receipt.set_result(receipt)
+                    elif time.time() - pending.created_at > self.receipt_timeout:
+                        await self._abandon(pending, f"No receipt after {self.receipt_timeout:g} seconds")
+                    elif time.time() - pending.submitted_at > self.stuck_after:
+                        if pending.replacements >= self.max_replacements:
+                            await self._abandon(pending, f"Still pending after {pending.replacements} replacements")
+                        else:
+                            await self._replace(pending)
+                except Exception as e:
+                    print(f"Error tracking transaction with nonce {nonce}: {str(e)}")
+
+    async def _abandon(self, pending: PendingTransaction, reason: str):
+        """Stop tracking a transaction that won't confirm and fail whoever waits on it"""
+        if self._pending.get(pending.nonce) is not pending:
+            return
+        print(f"Giving up on transaction with nonce {pending.nonce}: {reason}")
+        del self._pending[pending.nonce]
+        # If it was dropped its nonce is free again; the node knows either way
+        await self.nonces.resync()
+        if not pending.receipt.done():
+            pending.receipt.set_exception(Exception(reason))
+            # Mark it retrieved so a transaction nobody waits on doesn't log a warning
+            pending.receipt.exception()
+
+    def _record_receipt(self, pending: PendingTransaction, receipt):
+        status = "success" if receipt.status == 1 else "reverted"
+        elapsed = time.time() - pending.created_at
+        metrics.TX_GAS_USED.labels(status=status).inc(receipt.gasUsed)
+        metrics.TX_CONFIRMATION_SECONDS.observe(elapsed)
+        metrics.TRACE.record("tx", status, elapsed, nonce=pending.nonce,
+                             gas_used=receipt.gasUsed, replacements=pending.replacements)
+
+    async def _find_receipt(self, pending: PendingTransaction):
+        for tx_hash in reversed(pending.tx_hashes):
+            try:
+                return await self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+        return None
+
+    async def _replace(self, pending: PendingTransaction):
+        """Re-broadcast a stuck transaction with the same nonce and higher fees"""
+        tx = dict(pending.tx)
+        current = await self.fees.fees()
+        if 'maxFeePerGas' in tx:
+            # Nodes only accept a replacement when both fee fields go up
+            tx['maxPriorityFeePerGas'] = max(int(tx['maxPriorityFeePerGas'] * self.gas_bump) + 1,
+                                             current.get('maxPriorityFeePerGas', 0))
+            tx['maxFeePerGas'] = max(int(tx['maxFeePerGas'] * self.gas_bump) + 1,
+                                     current.get('maxFeePerGas', 0),
+                                     tx['maxPriorityFeePerGas'])
+        else:
+            tx['gasPrice'] = max(int(tx['gasPrice'] * self.gas_bump) + 1,
+                                 current.get('gasPrice', 0))
+        try:
+            async with self._send_lock:
+                tx_hash = await self._broadcast(tx)
+        except Exception as e:
+            if "underpriced" in str(e).lower():
+                # Not enough of a bump for this node; compound it next time
+                pending.tx = tx
+                pending.submitted_at = time.time()
+                return
+            if is_nonce_error(e):
+                # The original (or an earlier replacement) is being mined
+                pending.submitted_at = time.time()
+                return
+            raise
+
+        print(f"Replaced stuck transaction with nonce {pending.nonce}")
+        metrics.TX_SENT.labels(kind="replacement").inc()
+        pending.tx = tx
+        pending.tx_hashes.append(tx_hash)
+        pending.submitted_at = time.time()
+        pending.replacements += 1
@@ -1,21 +1,54 @@
 # packages/ai-agents/src/validator_agent.py
-from github_client import GitHubClient
+from github_graphql import create_github_client
 from ai_analyzer import DeveloperAnalyzer
 from contract_integrator import ContractIntegrator
-from eth_account import Account
+from job_queue import JobQueue
+from worker import REGISTER
 import json
-from typing import Dict, Any
+import os
+from functools import cached_property
+from typing import Dict, Any, Awaitable, Callable
 
 class ValidatorAgent:
     def __init__(self):
-        self.github = GitHubClient()
-        self.analyzer = DeveloperAnalyzer()
-        self.contract = ContractIntegrator()
         self.min_confidence_score = 75
 
-    async def validate_user(self, github_username: str, wallet_address: str) -> Dict[str, Any]:
+        # Registrations go through the worker queue when it is enabled
+        self.registration_queue = JobQueue() if os.getenv("REGISTRATION_QUEUE_ENABLED", "false").lower() == "true" else None
+
+    # Built on first use so the API server can start while the RPC node
+    # or the API keys are unavailable
+
+    @cached_property
+    def github(self):
+        return create_github_client()
+
+    @cached_property
+    def analyzer(self) -> DeveloperAnalyzer:
+        return DeveloperAnalyzer()
+
+    @cached_property
+    def contract(self) -> ContractIntegrator:
+        return ContractIntegrator()
+
+    async def aclose(self):
+        """Release pooled connections held by the agent's clients"""
+        if 'github' in self.__dict__:
+            await self.github.aclose()
+        if 'contract' in self.__dict__:
+            await self.contract.aclose()
+
+    async def validate_user(self,
+                            github_username: str,
+                            wallet_address: str,
+                            progress: Callable[[str], Awaitable[None]] = None) -> Dict[str, Any]:
+        async def report(stage: str):
+            if progress is not None:
+                await progress(stage)
+
         # Check if already registered
-        if self.contract.check_if_registered(github_username):
+        await report("checking_registration")
+        if await self.contract.check_if_registered(github_username):
             return {
                 "valid": False,
                 "reason": "Profile already exists",
@@ -23,6 +56,7 @@ class ValidatorAgent:
             }
 
         # Get GitHub data
+        await report("fetching_github")
         dev_data = await self.github.get_developer_data(github_username)
         if not dev_data:
             return {
@@ -32,7 +66,8 @@ class ValidatorAgent:
             }
 
         # Analyze developer
-        analysis = self.analyzer.analyze_developer(dev_data)
+        await report("analyzing")
+        analysis = await self.analyzer.analyze_developer(dev_data)
         if not analysis:
             return {
                 "valid": False,
@@ -42,16 +77,32 @@ class ValidatorAgent:
 
         is_valid = analysis['confidence_score'] >= self.min_confidence_score
 
+        if is_valid and self.registration_queue is not None:
+            # Hand the transaction to the registration worker instead of
+            # sending it from the API process
+            job = self.registration_queue.enqueue(
+                REGISTER,
+                {'username': github_username, 'analysis': analysis, 'developer_address': wallet_address},
+                key=github_username
+            )
+            reason = ("Profile validated, registration in progress" if job['status'] == "running"
+                      else "Profile validated, registration queued")
+            return {
+                "valid": True,
+                "analysis": analysis,
+                "reason": reason,
+                "registration_job_id": job['id'],
+                "registration_status": job['status'],
+                "can_claim": False
+            }
+
         if is_valid:
-            # Register developer
-            token_name = f"{github_username}Token"
-            token_symbol = f"${github_username[:4].upper()}"
-            
-            result = self.contract.register_developer(
+            # Register developer to the wallet they validated with
+            await report("registering")
+            result = await self.contract.register_developer(
                 github_username,
-                wallet_address,
-                token_name,
-                token_symbol
+                analysis,
+                developer_address=wallet_address
             )
 
             if not result['success']:
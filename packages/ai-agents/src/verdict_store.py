@@ -0,0 +1,44 @@
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+from sqlite_store import SQLiteStore, data_path
+
+class QualityVerdictStore(SQLiteStore):
+    """Persistent pass/fail verdicts of the discovery quality check, keyed by username
+
+    Each verdict keeps the inputs that decided it so rejections can be
+    audited. Verdicts older than the re-check TTL are ignored and the
+    developer is evaluated again.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS verdicts (
+            username TEXT PRIMARY KEY,
+            passed INTEGER NOT NULL,
+            checked_at REAL NOT NULL,
+            inputs TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = None, ttl: float = None):
+        super().__init__(path or os.getenv("GITHUB_VERDICT_PATH") or data_path("quality_verdicts.sqlite"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("GITHUB_VERDICT_TTL", str(7 * 24 * 3600)))
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """Return the stored verdict if it is still within the re-check TTL"""
+        row = self.fetchone("SELECT * FROM verdicts WHERE username = ?", (username.lower(),))
+        if row is None or time.time() - row["checked_at"] > self.ttl:
+            return None
+        return {
+            "passed": bool(row["passed"]),
+            "checked_at": row["checked_at"],
+            "inputs": json.loads(row["inputs"])
+        }
+
+    def record(self, username: str, passed: bool, inputs: Dict[str, Any]):
+        self.execute(
+            "INSERT OR REPLACE INTO verdicts (username, passed, checked_at, inputs) VALUES (?, ?, ?, ?)",
+            (username.lower(), int(passed), time.time(), json.dumps(inputs))
+        )
@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+from functools import cached_property
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+from ai_analyzer import EnhancedDeveloperAnalyzer
+from contract_integrator import EnhancedContractIntegrator
+from github_graphql import create_github_client
+from job_queue import JobQueue
+from prescoring import Prescorer
+
+# Job kinds; registrations are sent from a single process so one
+# TransactionManager owns the signer's nonces
+DISCOVER = "discover"
+ANALYZE = "analyze"
+REGISTER = "register"
+
+class Worker:
+    """Consumes queued discovery, analysis and registration jobs"""
+
+    def __init__(self, kinds: List[str], name: str, concurrency: int = None, exit_when_idle: bool = False):
+        load_dotenv()
+        self.kinds = kinds
+        self.name = name
+        self.concurrency = concurrency or int(os.getenv("WORKER_CONCURRENCY", "4"))
+        self.exit_when_idle = exit_when_idle
+        self.poll_interval = float(os.getenv("WORKER_POLL_INTERVAL", "1"))
+        self.lease = float(os.getenv("JOB_LEASE_SECONDS", "900"))
+        self.min_confidence_score = int(os.getenv("WORKER_MIN_CONFIDENCE", "65"))
+        self.prescore_enabled = os.getenv("PRESCORE_ENABLED", "false").lower() == "true"
+        # Register jobs are claimed in groups and sent through registerDevelopers
+        self.batch_registration = os.getenv("WORKER_BATCH_REGISTRATION", "false").lower() == "true"
+        self.queue = JobQueue()
+
+    # Each process only builds the clients its job kinds use
+
+    @cached_property
+    def github(self):
+        return create_github_client()
+
+    @cached_property
+    def analyzer(self) -> EnhancedDeveloperAnalyzer:
+        return EnhancedDeveloperAnalyzer()
+
+    @cached_property
+    def contract(self) -> EnhancedContractIntegrator:
+        return EnhancedContractIntegrator()
+
+    @cached_property
+    def prescorer(self) -> Prescorer:
+        return Prescorer()
+
+    @cached_property
+    def analyze_batch_size(self) -> int:
+        """Analysis jobs claimed together, by default one GraphQL query's worth"""
+        return int(os.getenv("WORKER_ANALYZE_BATCH_SIZE") or getattr(self.github, "batch_size", 1))
+
+    async def run(self):
+        """Claim and run jobs until stopped, or until idle with exit_when_idle"""
+        print(f"Worker {self.name} consuming {', '.join(self.kinds)}")
+        try:
+            if self.batch_registration and self.kinds == [REGISTER]:
+                slot = self._run_register_batches
+            else:
+                slot = self._run_slot
+            await asyncio.gather(*(slot() for _ in range(self.concurrency)))
+        finally:
+            if 'github' in self.__dict__:
+                await self.github.aclose()
+            if 'contract' in self.__dict__:
+                await self.contract.aclose()
+
+    async def _run_slot(self):
+        while True:
+            job = self.queue.claim(self.kinds, self.name, self.lease)
+            if job is None:
+                if self.exit_when_idle and not self.queue.has_open_jobs(self.kinds):
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if job['kind'] != ANALYZE:
+                await self._run_job(job)
+                continue
+
+            # Take more analyses along so their profiles come in one batched fetch
+            jobs = [job]
+            while len(jobs) < self.analyze_batch_size:
+                extra = self.queue.claim([ANALYZE], self.name, self.lease)
+                if extra is None:
+                    break
+                jobs.append(extra)
+
+            unstarted = list(jobs)
+            try:
+                profiles = await self._prefetch_profiles([job['payload'] for job in jobs]) if len(jobs) > 1 else {}
+                while unstarted:
+                    job = unstarted.pop(0)
+                    await self._run_job(job, dev_data=profiles.get(job['payload']['username']))
+            except asyncio.CancelledError:
+                for job in unstarted:
+                    self.queue.release(job['id'])
+                raise
+
+    async def _run_job(self, job: Dict[str, Any], **kwargs):
+        try:
+            result = await getattr(self, f"_handle_{job['kind']}")(job['payload'], **kwargs)
+            self.queue.ack(job['id'], result)
+        except asyncio.CancelledError:
+            self.queue.release(job['id'])
+            raise
+        except Exception as e:
+            print(f"Job {job['id']} ({job['kind']}) failed on attempt {job['attempts']}: {str(e)}")
+            self.queue.fail(job['id'], str(e))
+
+    async def _prefetch_profiles(self, payloads: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Profiles of the unregistered developers among payloads, fetched together
+
+        Anyone missing from the result goes through _handle_analyze's own
+        check and single-user fetch.
+        """
+        try:
+            usernames = [payload['username'] for payload in payloads]
+            registered = await self.contract.check_many_registered(usernames)
+            unregistered = [username for username in usernames if not registered.get(username)]
+            return await self.github.get_developers_data(unregistered) if unregistered else {}
+        except Exception as e:
+            print(f"Error prefetching {len(payloads)} profiles: {str(e)}")
+            return {}
+
+    async def _run_register_batches(self):
+        """Claim up to REGISTRATION_BATCH_SIZE register jobs at a time and register them together"""
+        while True:
+            jobs = []
+            while len(jobs) < self.contract.registration_batch_size:
+                job = self.queue.claim([REGISTER], self.name, self.lease)
+                if job is None:
+                    break
+                jobs.append(job)
+            if not jobs:
+                if self.exit_when_idle and not self.queue.has_open_jobs(self.kinds):
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            try:
+                results = await self._register_batch([job['payload'] for job in jobs])
+            except asyncio.CancelledError:
+                for job in jobs:
+                    self.queue.release(job['id'])
+                raise
+            except Exception as e:
+                print(f"Batch of {len(jobs)} registrations failed: {str(e)}")
+                results = {job['payload']['username']: {'success': False, 'error': str(e)} for job in jobs}
+
+            for job in jobs:
+                result = results.get(job['payload']['username'], {'success': False, 'error': "No registration result"})
+                if result.get('registered') or result.get('success'):
+                    self.queue.ack(job['id'], result)
+                else:
+                    print(f"Job {job['id']} (register) failed on attempt {job['attempts']}: {result.get('error')}")
+                    self.queue.fail(job['id'], result.get('error') or "Registration failed")
+
+    async def _register_batch(self, payloads: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Batched _handle_register; a retry after a crash finds the earlier registrations"""
+        registered = await self.contract.check_many_registered([payload['username'] for payload in payloads])
+        results = {payload['username']: {'registered': True} for payload in payloads if registered.get(payload['username'])}
+        pending = [
+            (payload['username'], payload['analysis'], payload.get('developer_address'))
+            for payload in payloads if payload['username'] not in results
+        ]
+        results.update(await self.contract.register_developers(pending))
+        return results
+
+    async def _handle_discover(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an analysis for every candidate that passes the quality check"""
+        queued = []
+        async for username in self.github.iter_web3_developers(limit=payload.get('limit', 20)):
+            self.queue.enqueue(ANALYZE, {'username': username}, key=username)
+            queued.append(username)
+        return {'queued': queued}
+
+    async def _handle_analyze(self, payload: Dict[str, Any], dev_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Fetch and score a developer, queueing a registration if they qualify
+
+        dev_data is a profile already fetched for an unregistered developer.
+        """
+        username = payload['username']
+        if dev_data is None:
+            if await self.contract.check_if_registered(username):
+                return {'registered': True}
+            dev_data = await self.github.get_developer_data(username)
+        if not dev_data:
+            raise Exception(f"Could not fetch data for {username}")
+        if self.prescore_enabled and not self.prescorer.filter([(username, dev_data)]):
+            return {'qualified': False, 'prescored_out': True}
+        analysis = await self.analyzer.analyze_developer(dev_data)
+        if not analysis:
+            raise Exception(f"Could not analyze {username}")
+
+        score = analysis['confidence_score']
+        if score < self.min_confidence_score:
+            return {'qualified': False, 'confidence_score': score}
+
+        job = self.queue.enqueue(REGISTER, {'username': username, 'analysis': analysis}, key=username)
+        return {'qualified': True, 'confidence_score': score, 'registration_job': job['id']}
+
+    async def _handle_register(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a developer; a retry after a crash finds the earlier registration"""
+        username = payload['username']
+        if await self.contract.check_if_registered(username):
+            return {'registered': True}
+
+        result = await self.contract.register_developer(
+            username, payload['analysis'], developer_address=payload.get('developer_address')
+        )
+        if not result['success']:
+            raise Exception(result.get('error') or "Registration failed")
+        return result
+
+def _run_worker(kinds: List[str], name: str, concurrency: int, exit_when_idle: bool):
+    worker = Worker(kinds, name, concurrency, exit_when_idle)
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+
+def run_pool(workers: int, exit_when_idle: bool = False):
+    """Start analysis worker processes plus the single registration process"""
+    context = multiprocessing.get_context("spawn")
+    host = socket.gethostname()
+    processes = [
+        context.Process(target=_run_worker, args=([DISCOVER, ANALYZE], f"{host}-{i}", None, exit_when_idle))
+        for i in range(workers)
+    ]
+    processes.append(context.Process(
+        target=_run_worker,
+        args=([REGISTER], f"{host}-register", int(os.getenv("WORKER_REGISTER_CONCURRENCY", "4")), exit_when_idle)
+    ))
+
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="TalentFi registration job queue")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    discover = commands.add_parser("discover", help="queue a discovery run")
+    discover.add_argument("--limit", type=int, default=20)
+
+    analyze = commands.add_parser("analyze", help="queue analysis of specific GitHub users")
+    analyze.add_argument("usernames", nargs="+")
+
+    run = commands.add_parser("run", help="start the worker pool")
+    run.add_argument("--workers", type=int, default=int(os.getenv("WORKER_PROCESSES", str(os.cpu_count() or 2))))
+    run.add_argument("--exit-when-idle", action="store_true")
+
+    commands.add_parser("status", help="show job counts and registrations")
+
+    args = parser.parse_args()
+    queue = JobQueue()
+
+    if args.command == "discover":
+        # A new discovery run each time; a candidate whose analysis is
+        # still queued or running isn't queued twice
+        job = queue.enqueue(DISCOVER, {'limit': args.limit}, max_attempts=3)
+        print(f"Queued discovery job {job['id']}")
+    elif args.command == "analyze":
+        for username in args.usernames:
+            job = queue.enqueue(ANALYZE, {'username': username}, key=username)
+            print(f"Analysis of {username}: job {job['id']} {job['status']}")
+    elif args.command == "run":
+        run_pool(args.workers, args.exit_when_idle)
+    elif args.command == "status":
+        print(json.dumps(queue.counts(), indent=2))
+        for job in queue.jobs(kind=REGISTER, status="done"):
+            result = job['result'] or {}
+            print(f"- {job['payload']['username']}: {result.get('token_address') or 'already registered'}")
+        for job in queue.jobs(status="dead"):
+            print(f"- dead {job['kind']} job {job['id']}: {job['error']}")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,13 @@ contract AutoRegistration {
     TalentRegistry public immutable registry;
     Investment public immutable investment;
 
+    struct Registration {
+        string githubUsername;
+        string tokenName;
+        string tokenSymbol;
+        address developerAddress;
+    }
+
     mapping(string => bool) public isRegistered;
     address public registrationAgent;
 
@@ -24,6 +31,12 @@ contract AutoRegistration {
         string tokenSymbol
     );
 
+    event DeveloperRegistrationFailed(
+        string githubUsername,
+        address indexed developerAddress,
+        bytes reason
+    );
+
     constructor(address _registry, address _investment, address _agent) {
         registry = TalentRegistry(_registry);
         investment = Investment(_investment);
@@ -45,6 +58,64 @@ contract AutoRegistration {
         string calldata _tokenSymbol,
         address _developerAddress
     ) external onlyAgent {
+        _registerDeveloper(
+            _githubUsername,
+            _tokenName,
+            _tokenSymbol,
+            _developerAddress
+        );
+    }
+
+    // Registers a cohort in one transaction. A failing entry emits
+    // DeveloperRegistrationFailed and is rolled back on its own while the
+    // rest of the batch goes through.
+    function registerDevelopers(
+        Registration[] calldata _registrations
+    ) external onlyAgent returns (uint256 registered) {
+        for (uint256 i = 0; i < _registrations.length; i++) {
+            Registration calldata entry = _registrations[i];
+            try
+                this.registerFromBatch(
+                    entry.githubUsername,
+                    entry.tokenName,
+                    entry.tokenSymbol,
+                    entry.developerAddress
+                )
+            {
+                registered++;
+            } catch (bytes memory reason) {
+                emit DeveloperRegistrationFailed(
+                    entry.githubUsername,
+                    entry.developerAddress,
+                    reason
+                );
+            }
+        }
+    }
+
+    // External so each batch entry runs in its own call frame and can
+    // revert independently; only callable from registerDevelopers.
+    function registerFromBatch(
+        string calldata _githubUsername,
+        string calldata _tokenName,
+        string calldata _tokenSymbol,
+        address _developerAddress
+    ) external {
+        if (msg.sender != address(this)) revert Unauthorized();
+        _registerDeveloper(
+            _githubUsername,
+            _tokenName,
+            _tokenSymbol,
+            _developerAddress
+        );
+    }
+
+    function _registerDeveloper(
+        string calldata _githubUsername,
+        string calldata _tokenName,
+        string calldata _tokenSymbol,
+        address _developerAddress
+    ) internal {
         if (isRegistered[_githubUsername]) revert AlreadyRegistered();
 
         // Register developer through the registry
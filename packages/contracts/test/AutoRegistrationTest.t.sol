@@ -131,4 +131,78 @@ contract AutoRegistrationTest is Test {
         );
         assertTrue(autoReg.isRegistered(GITHUB_USERNAME));
     }
+
+    function testBatchRegistration() public {
+        address otherDeveloper = address(3);
+
+        // Register one developer up front so its batch entry fails
+        vm.startPrank(agent);
+        autoReg.registerDeveloper(
+            GITHUB_USERNAME,
+            TOKEN_NAME,
+            TOKEN_SYMBOL,
+            developer
+        );
+
+        AutoRegistration.Registration[]
+            memory batch = new AutoRegistration.Registration[](2);
+        batch[0] = AutoRegistration.Registration(
+            GITHUB_USERNAME,
+            "Another Token",
+            "ATK",
+            address(4)
+        );
+        batch[1] = AutoRegistration.Registration(
+            "other-dev",
+            "Other Token",
+            "OTH",
+            otherDeveloper
+        );
+
+        vm.expectEmit(true, false, false, true);
+        emit AutoRegistration.DeveloperRegistrationFailed(
+            GITHUB_USERNAME,
+            address(4),
+            abi.encodeWithSelector(AutoRegistration.AlreadyRegistered.selector)
+        );
+        uint256 registered = autoReg.registerDevelopers(batch);
+        vm.stopPrank();
+
+        assertEq(registered, 1, "Only the new developer should register");
+        assertTrue(autoReg.isRegistered("other-dev"));
+        assertTrue(
+            investment.getTokenByDeveloper(otherDeveloper) != address(0),
+            "Token should be created for the new developer"
+        );
+        assertEq(
+            investment.getTokenByDeveloper(address(4)),
+            address(0),
+            "Failed entry should be rolled back"
+        );
+    }
+
+    function testOnlyAgentCanBatchRegister() public {
+        AutoRegistration.Registration[]
+            memory batch = new AutoRegistration.Registration[](1);
+        batch[0] = AutoRegistration.Registration(
+            GITHUB_USERNAME,
+            TOKEN_NAME,
+            TOKEN_SYMBOL,
+            developer
+        );
+
+        vm.prank(address(999));
+        vm.expectRevert(AutoRegistration.Unauthorized.selector);
+        autoReg.registerDevelopers(batch);
+
+        // The per-entry helper is reserved for the contract itself
+        vm.prank(agent);
+        vm.expectRevert(AutoRegistration.Unauthorized.selector);
+        autoReg.registerFromBatch(
+            GITHUB_USERNAME,
+            TOKEN_NAME,
+            TOKEN_SYMBOL,
+            developer
+        );
+    }
 }